@@ -23,5 +23,7 @@ def create_app():
     return app
 
 if __name__ == '__main__':
+    # Development server only; use wsgi.py with gunicorn/waitress in production
     app = create_app()
-    app.run(debug=True, threaded=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    debug = os.environ.get('FLASK_ENV') == 'development'
+    app.run(debug=debug, threaded=True, host='127.0.0.1', port=5000)
\ No newline at end of file
@@ -10,8 +10,25 @@ import time
 import cv2
 import numpy as np
 import os
-from app.backend.exercise_modules.exercise_tracker import ExerciseTracker
+from concurrent.futures import ThreadPoolExecutor
+from app.backend.exercise_modules.exercise_tracker import create_tracker
 from app.backend.exercise_modules.pose_detector import PoseDetector
+from app.backend.config.config import get_config
+from app.backend.utils.camera import ThreadedCamera
+
+try:
+    # PyTurboJPEG - calls libjpeg-turbo's SIMD encoder directly
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError):
+    # OSError: the Python package is installed but the libturbojpeg library isn't
+    _turbojpeg = None
+
+try:
+    # libjpeg-turbo bindings - noticeably faster than cv2.imencode for MJPEG
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
 
 # Global variables
 camera = None
@@ -21,71 +38,231 @@ rep_count = 0
 is_running = False
 lock = threading.Lock()
 exercise_tracker = None
+# Latest tracker results, published by the capture thread as a fresh dict so
+# /get-reps can read them without taking the lock (the rebind is atomic)
+_state = {'count': 0, 'suggestion': "", 'form_quality': "Neutral"}
+_needs_resize = True  # False once the camera is known to deliver 640x480 natively
+
+# Frame pipeline: a capture thread processes frames and publishes the latest
+# JPEG here; every /video_feed generator waits on _frame_cond for a newer
+# _frame_seq, so pose detection runs once no matter how many clients watch
+_frame_cond = threading.Condition()
+_latest_jpeg = None
+_frame_seq = 0
+_should_stop = threading.Event()
+_capture_thread = None
+# Single worker so encoding frame N overlaps capture and pose detection of N+1
+# while frames are still published in order
+_encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jpeg-encoder")
+
+# JPEG quality for idle scenes, bumped while the rep bar / form feedback changes
+_JPEG_QUALITY = get_config("STREAM", "JPEG_QUALITY")
+_JPEG_QUALITY_ACTIVE = get_config("STREAM", "JPEG_QUALITY_ACTIVE")
+
+# Multipart part header for the MJPEG stream. The JPEG is yielded as its own
+# chunk instead of being concatenated with the header, and Content-Length lets
+# the browser take the part without scanning it for the boundary.
+_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+_PART_TRAILER = b'\r\n'
 
-# Initial detected object for food recognition
+# Initial detected object for food recognition, guarded by its own lock so
+# /update and /get_object polling never contend with the exercise state lock
 detected_object = "None"
+_object_lock = threading.Lock()
 
-def generate_frames():
-    """Generate video frames for streaming"""
-    global camera, detector, exercise_type, rep_count, is_running
-    last_processing_time = time.time()
-    frame_interval = 1/30  # Target 30 FPS
+def _encode_jpeg(img, quality=_JPEG_QUALITY):
+    """Encode a BGR frame as JPEG bytes, using libjpeg-turbo bindings when installed"""
+    if _turbojpeg is not None:
+        return _turbojpeg.encode(img, quality=quality, pixel_format=TJPF_BGR,
+                                 jpeg_subsample=TJSAMP_420)
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(np.ascontiguousarray(img), quality=quality,
+                                      colorspace='BGR', colorsubsampling='420',
+                                      fastdct=True)
+    _, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes()
+
+def _build_blank_frame():
+    """Build the JPEG shown while exercise tracking is not active"""
+    blank_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    cv2.putText(blank_frame, "Exercise tracking not active", (150, 240),
+                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    return _encode_jpeg(blank_frame)
+
+# The idle frame never changes, so encode it once instead of on every tick
+_BLANK_FRAME_BYTES = _build_blank_frame()
+
+def _create_detector():
+    """Create the pose detector for the configured backend"""
+    pose_config = get_config("POSE")
+    if pose_config.get("BACKEND") == "onnx":
+        # Imported lazily so onnxruntime is only needed when this backend is used
+        from app.backend.exercise_modules.pose_detector_onnx import OnnxPoseDetector
+        return OnnxPoseDetector(pose_config["ONNX_MODEL"],
+                                num_threads=pose_config["ONNX_THREADS"],
+                                infer_every=pose_config["INFER_EVERY"])
+    if pose_config.get("BACKEND") == "tasks":
+        from app.backend.exercise_modules.pose_detector_tasks import TasksPoseDetector
+        return TasksPoseDetector(pose_config["TASKS_MODEL"],
+                                 use_gpu=pose_config["USE_GPU"],
+                                 infer_every=pose_config["INFER_EVERY"])
+    return PoseDetector(profile=pose_config["PROFILE"], infer_every=pose_config["INFER_EVERY"])
+
+def _get_detector():
+    """Return the shared pose detector, creating and warming it up on first use"""
+    global detector
+    if detector is None:
+        detector = _create_detector()
+        # One dummy frame pays the model's lazy initialisation before the first real frame
+        detector.findPose(np.zeros((480, 640, 3), dtype=np.uint8), draw=False)
+    return detector
+
+def _publish_frame(frame):
+    """Replace the latest JPEG and wake every streaming generator"""
+    global _latest_jpeg, _frame_seq
+    with _frame_cond:
+        _latest_jpeg = frame
+        _frame_seq += 1
+        _frame_cond.notify_all()
+
+def _encode_and_publish(img, quality):
+    """Encode a processed frame and publish it (runs on the encoder thread)"""
+    _publish_frame(_encode_jpeg(img, quality=quality))
+
+def _capture_loop():
+    """Read, analyse and encode camera frames until asked to stop (runs on its own thread)"""
+    global rep_count, _state
+    # Destinations for cv2.resize, owned by this thread so frames don't allocate.
+    # Two buffers alternate because the previous frame may still be encoding.
+    resize_bufs = (np.empty((480, 640, 3), dtype=np.uint8),
+                   np.empty((480, 640, 3), dtype=np.uint8))
+    frame_index = 0
+    pending = None  # Encode of the previous frame
+    last_per = 0.0
+    last_form_quality = None
     
-    while True:
-        current_time = time.time()
-        
-        # Skip processing if it's been less than the frame interval (prevents overloading CPU)
-        if current_time - last_processing_time < frame_interval:
-            time.sleep(0.001)  # Small sleep to prevent CPU hogging
-            continue
-            
-        last_processing_time = current_time
-        
-        if not is_running:
-            # If we're not tracking, just yield a blank frame
-            blank_frame = np.zeros((480, 640, 3), dtype=np.uint8)  # Smaller blank frame
-            cv2.putText(blank_frame, "Exercise tracking not active", (150, 240), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            _, buffer = cv2.imencode('.jpg', blank_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            frame = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-            time.sleep(0.03)  # Slower refresh when inactive
-            continue
-        
+    while not _should_stop.is_set():
         # Try to read frame with error handling
         try:    
+            # The camera's reader thread keeps the newest frame in memory
             success, img = camera.read()
             if not success:
                 time.sleep(0.01)
                 continue  # Skip this iteration and try again
             
-            # Lower resolution for better performance (640x480 instead of 1280x720)
-            img = cv2.resize(img, (640, 480))
+            # Lower resolution for better performance, unless the camera already delivers 640x480
+            if _needs_resize:
+                img = cv2.resize(img, (640, 480), dst=resize_bufs[frame_index & 1],
+                                 interpolation=cv2.INTER_LINEAR)
+            frame_index += 1
             
-            # Detect pose
+            # Detect pose; the detector decides when to skip inference and
+            # extrapolates the landmarks on the frames in between
             img = detector.findPose(img, draw=True)
-            lmList = detector.findPosition(img, draw=False)
             
-            with lock:
-                if exercise_tracker:
-                    img = exercise_tracker.process_frame(img, lmList, detector)
-                    rep_count = exercise_tracker.count
+            quality = _JPEG_QUALITY
+            # Only this thread touches the tracker while it runs, so process the
+            # frame without holding the lock and publish a snapshot afterwards
+            tracker = exercise_tracker
+            if tracker and not detector.inferred:
+                # Extrapolated landmarks only keep the skeleton smooth; reps and
+                # form are judged on real inferences, so just redraw the overlay
+                img = tracker.draw_overlay(img)
+            elif tracker:
+                lmList = detector.findPositionArray(img)
+                img = tracker.process_frame(img, lmList, detector)
+                rep_count = tracker.count
+                _state = {'count': tracker.count,
+                          'suggestion': tracker.get_suggestion(),
+                          'form_quality': tracker.form_quality}
+                
+                # Spend extra bytes only while the overlay is visibly changing
+                if (tracker.form_quality != last_form_quality
+                        or abs(tracker.per - last_per) > 5):
+                    quality = _JPEG_QUALITY_ACTIVE
+                last_form_quality = tracker.form_quality
+                last_per = tracker.per
             
-            # Encode with lower quality for faster streaming
-            _, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            frame = buffer.tobytes()
-            
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            # Keep at most one encode in flight; it has almost always finished by
+            # now, and waiting guarantees the other resize buffer is free again
+            if pending is not None:
+                previous, pending = pending, None
+                previous.result()
+            # Encode and publish on the encoder thread while the next frame is processed
+            pending = _encoder.submit(_encode_and_publish, img, quality)
                    
         except Exception as e:
             print(f"Frame generation error: {e}")
             time.sleep(0.01)  # Small delay before retrying
+    
+    # Don't let a late encode publish after the stream has been cleared
+    if pending is not None:
+        try:
+            pending.result()
+        except Exception as e:
+            print(f"Frame generation error: {e}")
+
+def _start_capture_thread():
+    """Start the background thread that publishes processed frames"""
+    global _capture_thread
+    if _capture_thread is not None:
+        raise RuntimeError("Capture thread is still running")
+    _should_stop.clear()
+    _capture_thread = threading.Thread(target=_capture_loop, daemon=True)
+    _capture_thread.start()
+
+def _stop_capture_thread():
+    """
+    Signal the capture thread to stop and wait for it to exit.
+    
+    Returns:
+        True once no capture thread is running; False if it is still busy
+        (e.g. in a slow findPose) after the timeout, in which case the handle
+        is kept and the camera must not be released yet
+    """
+    global _capture_thread, _latest_jpeg
+    _should_stop.set()
+    if _capture_thread is not None:
+        _capture_thread.join(timeout=2.0)
+        if _capture_thread.is_alive():
+            return False
+        _capture_thread = None
+    # Drop any frame left over from the previous session
+    with _frame_cond:
+        _latest_jpeg = None
+    return True
+
+def generate_frames():
+    """Generate video frames for streaming"""
+    last_seq = 0
+    while True:
+        if not is_running:
+            # If we're not tracking, just yield the cached blank frame
+            frame = _BLANK_FRAME_BYTES
+        else:
+            # Block (without polling) until the capture thread publishes a new frame;
+            # a slow client simply skips frames instead of stalling pose detection
+            with _frame_cond:
+                _frame_cond.wait_for(lambda: _frame_seq != last_seq, timeout=1.0)
+                frame = _latest_jpeg
+                last_seq = _frame_seq
+            if frame is None:
+                frame = _BLANK_FRAME_BYTES  # Camera stalled; keep the stream alive
+        
+        # Header, JPEG and trailer go out as separate chunks (no concatenation)
+        yield _PART_HEADER % len(frame)
+        yield frame
+        yield _PART_TRAILER
+        
+        if not is_running:
+            time.sleep(0.1)  # Slower refresh when inactive
 
 def register_routes(app):
     """Register all routes with the Flask app"""
     
+    # Load the pose model at startup instead of on the first /start-exercise
+    _get_detector()
+    
     @app.route('/')
     def index():
         # Redirect root to home page
@@ -176,11 +353,12 @@ def register_routes(app):
     @app.route('/video_feed')
     def video_feed():
         return Response(generate_frames(),
-                        mimetype='multipart/x-mixed-replace; boundary=frame')
+                        mimetype='multipart/x-mixed-replace; boundary=frame',
+                        direct_passthrough=True)
 
     @app.route('/start-exercise/<exercise>')
     def start_exercise(exercise):
-        global camera, detector, exercise_type, is_running, exercise_tracker
+        global camera, exercise_type, is_running, exercise_tracker, _needs_resize, _state
         
         # Check if exercise type is valid
         valid_exercises = ["lateral-rise", "alt-dumbbell-curls", "barbell-row", 
@@ -189,43 +367,60 @@ def register_routes(app):
         if exercise not in valid_exercises:
             return jsonify(success=False, error=f"Unknown exercise: {exercise}")
         
-        # Release any existing camera
+        # Stop any running capture thread and release the existing camera; a
+        # second thread must never share the detector and tracker with it
+        if not _stop_capture_thread():
+            return jsonify(success=False, error="The previous session is still stopping. Please try again.")
         if camera is not None:
             camera.release()
             time.sleep(0.5)  # Allow time for camera to fully release
         
-        # Initialize camera with specific settings for better performance
-        camera = cv2.VideoCapture(0)
+        # Initialize camera at a lower resolution for better performance; its
+        # reader thread keeps grabbing frames so the capture loop never blocks
+        # on USB I/O. DirectShow honours resolution requests far more reliably on Windows.
+        backend = cv2.CAP_DSHOW if os.name == 'nt' else cv2.CAP_ANY
+        camera = ThreadedCamera(0, backend, width=640, height=480, fps=30)
         
-        # Set lower resolution for better performance
-        camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        camera.set(cv2.CAP_PROP_FPS, 30)  # Target 30 FPS
+        # Only resize frames later if the camera ignored the requested resolution
+        _needs_resize = camera.frame_size != (640, 480)
         
         # Verify camera is working
-        success, _ = camera.read()
+        success, _ = camera.read(timeout=2.0)
         if not success:
             return jsonify(success=False, error="Could not access webcam. Please check your camera connection.")
         
-        detector = PoseDetector()
+        # The detector is shared across sessions; only its tracking state is reset
+        _get_detector().reset()
         exercise_type = exercise
         
         with lock:
-            exercise_tracker = ExerciseTracker(exercise)
+            exercise_tracker = create_tracker(exercise)
+            _state = {'count': 0, 'suggestion': "", 'form_quality': "Neutral"}
             is_running = True
         
+        # Only draw the joints this exercise actually tracks
+        detector.set_drawn_landmarks(exercise_tracker.points)
+        
+        _start_capture_thread()
+        
         return jsonify(success=True, message=f"Started {exercise} tracking")
 
     @app.route('/stop-exercise')
     def stop_exercise():
-        global camera, is_running, rep_count
+        global camera, is_running, rep_count, _state
         
+        # Stop the capture thread before reading the count, so a rep completed
+        # by a frame still in flight is not lost from final_count
+        stopped = _stop_capture_thread()
         with lock:
             is_running = False
-            final_count = rep_count
+            final_count = exercise_tracker.count if exercise_tracker is not None else rep_count
             rep_count = 0
+            _state = dict(_state, count=0)
         
-        if camera is not None:
+        # The capture thread must be gone before the camera is released; if it
+        # is still finishing a frame, the next start-exercise releases it
+        if stopped and camera is not None:
             camera.release()
             camera = None
         
@@ -235,20 +430,23 @@ def register_routes(app):
     # API to get rep count and suggestion
     @app.route('/get-reps')
     def get_reps():
-        with lock:
-            count = rep_count
-            suggestion = exercise_tracker.get_suggestion() if exercise_tracker else ""
-            # Add form quality information
-            form_quality = exercise_tracker.form_quality if exercise_tracker else "Neutral"
-            is_wrong_exercise = form_quality == "Wrong Exercise"
-        return jsonify(count=count, suggestion=suggestion, form_quality=form_quality, wrong_exercise=is_wrong_exercise)
+        # Read the capture thread's latest snapshot; no lock contention with the frame pipeline
+        s = _state
+        form_quality = s['form_quality']
+        is_wrong_exercise = form_quality == "Wrong Exercise"
+        return jsonify(count=s['count'], suggestion=s['suggestion'], form_quality=form_quality,
+                       wrong_exercise=is_wrong_exercise)
 
     @app.route('/update', methods=['POST'])
     def update():
         global detected_object
-        detected_object = request.json.get('object_name', 'None')
+        object_name = request.json.get('object_name', 'None')
+        with _object_lock:
+            detected_object = object_name
         return jsonify(success=True)
 
     @app.route('/get_object')
     def get_object():
-        return jsonify(object_name=detected_object)
\ No newline at end of file
+        with _object_lock:
+            object_name = detected_object
+        return jsonify(object_name=object_name)
\ No newline at end of file
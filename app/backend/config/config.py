@@ -24,6 +24,31 @@ CONFIG = {
         "FPS": 30
     },
     
+    "POSE": {
+        # "mediapipe" (default), "tasks" for the MediaPipe Tasks PoseLandmarker
+        # (supports GPU), or "onnx" to run an RTMPose model via ONNX Runtime
+        "BACKEND": os.environ.get("GYM_POSE_BACKEND", "mediapipe"),
+        # MediaPipe speed/accuracy profile: "fast" (Lite), "balanced" (Full) or "accurate" (Heavy)
+        "PROFILE": os.environ.get("GYM_POSE_PROFILE", "balanced"),
+        # Run the pose model on every Nth frame and extrapolate landmarks in between
+        # (it still runs on every frame while the pose is lost or uncertain)
+        "INFER_EVERY": 2,
+        "ONNX_MODEL": os.path.join(BASE_DIR, "models", "rtmpose-t.onnx"),
+        "ONNX_THREADS": 4,
+        # Model bundle for the "tasks" backend; the lite variant is the fastest
+        "TASKS_MODEL": os.path.join(BASE_DIR, "models", "pose_landmarker_lite.task"),
+        # Run the "tasks" backend on the GPU delegate (GYM_POSE_USE_GPU=1)
+        "USE_GPU": os.environ.get("GYM_POSE_USE_GPU", "0") == "1"
+    },
+    
+    "STREAM": {
+        # JPEG quality for the MJPEG stream; 60-70 is visually indistinguishable
+        # from 80 on a local network but noticeably smaller
+        "JPEG_QUALITY": int(os.environ.get("GYM_JPEG_QUALITY", 70)),
+        # Used instead while the rep bar or form feedback is changing
+        "JPEG_QUALITY_ACTIVE": 80
+    },
+    
     "EXERCISE": {
         "VALID_TYPES": [
             "lateral-rise", 
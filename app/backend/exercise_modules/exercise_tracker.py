@@ -2,9 +2,84 @@
 Exercise Tracker Class for tracking and analyzing different exercises.
 """
 
+import math
+
 import cv2
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Overlay colors (BGR) for each form quality: green for good form, red for bad
+# form or a wrong exercise, white for neutral; the label background is black
+# except for a wrong exercise, which gets a darker red
+_FORM_COLORS = {
+    "Good Form": (0, 255, 0),
+    "Bad Form": (0, 0, 255),
+    "Wrong Exercise": (0, 0, 255),
+    "Neutral": (255, 255, 255),
+}
+_BG_COLORS = {"Wrong Exercise": (0, 0, 128)}
+
+
+@njit(cache=True)
+def _analyze(lm, p1, p2, p3, low, per_slope, bar_slope):
+    """
+    Per-frame numeric kernel: joint angle at p2, rep percentage and bar height.
+    
+    Args:
+        lm: (33, 3) int array of [id, x, y] landmarks
+        p1, p2, p3: Landmark ids of the joint triple (p2 is the vertex)
+        low: Angle mapped to 0%
+        per_slope: Percentage gained per degree above low
+        bar_slope: Bar top-edge change per degree above low
+        
+    Returns:
+        tuple: (angle, per, bar_height)
+    """
+    x1, y1 = float(lm[p1, 1]), float(lm[p1, 2])
+    x2, y2 = float(lm[p2, 1]), float(lm[p2, 2])
+    x3, y3 = float(lm[p3, 1]), float(lm[p3, 2])
+    
+    angle = math.degrees(math.atan2(y3 - y2, x3 - x2) - math.atan2(y1 - y2, x1 - x2))
+    if angle < 0.0:
+        angle += 360.0
+    if angle > 180.0:
+        angle = 360.0 - angle
+    
+    # Linear maps onto 0-100% and the bar's top edge (350 -> 100), clamped like np.interp
+    offset = angle - low
+    per = min(max(offset * per_slope, 0.0), 100.0)
+    bar_height = min(max(350.0 + offset * bar_slope, 100.0), 350.0)
+    return angle, per, bar_height
+
+
+@njit(cache=True)
+def _tick(per, dir_, count):
+    """
+    Advance the rep counter's hysteresis state for one frame.
+    
+    Args:
+        per: Progress through the current rep, 0-100
+        dir_: 0 while waiting for the bottom (<= 5%), 1 while waiting for the top (>= 95%)
+        count: Reps counted so far
+        
+    Returns:
+        tuple: (dir_, count) after this frame
+    """
+    if per >= 95.0 and dir_ == 1:
+        return 0, count + 1
+    if per <= 5.0 and dir_ == 0:
+        return 1, count
+    return dir_, count
+
+
 class ExerciseTracker:
     """
     A class for tracking and analyzing different exercises.
@@ -26,366 +101,250 @@ class ExerciseTracker:
         form_quality: Quality assessment of current form
     """
     
-    def __init__(self, exercise_type):
+    # Exercise-specific parameters, overridden by the per-exercise subclasses
+    EXERCISE_TYPE = None
+    LOW = 70  # Angle mapped to 0% of a rep
+    HIGH = 160  # Angle mapped to 100% of a rep
+    CONFIDENCE_THRESHOLD = 0.0  # For motion validation
+    # Left Shoulder (11), Left Elbow (13), Left Wrist (15)
+    POINTS = (11, 13, 15)
+    HISTORY_LEN = 10  # Frames of wrist / elbow positions kept for validation
+    
+    # cv2.getTextSize results keyed by (text, font, scale, thickness); the
+    # overlay only ever measures a handful of fixed strings
+    _TEXT_SIZE_CACHE = {}
+    # Pre-rendered form quality labels keyed by label, as (roi, pixels)
+    _FORM_PANEL_CACHE = {}
+    
+    def __init__(self, exercise_type=None):
         """
         Initialize the ExerciseTracker for a specific exercise.
         
         Args:
-            exercise_type: The type of exercise to track
+            exercise_type: The type of exercise to track (defaults to EXERCISE_TYPE)
         """
-        self.exercise_type = exercise_type
+        self.exercise_type = exercise_type or self.EXERCISE_TYPE
         self.count = 0
-        self.dir = 0  # 0: not started, 1: going up/down
+        self.dir = 0  # 0: waiting for the bottom (<= 5%), 1: waiting for the top (>= 95%)
         self.angle = 0
-        # Default range values - will be overridden based on exercise
-        self.low = 70
-        self.high = 160
+        self.per = 0.0  # Progress through the current rep, 0-100
+        self.low = self.LOW
+        self.high = self.HIGH
+        self.points = list(self.POINTS)
         self.suggestion = ""
         self.form_quality = "Neutral"  # Can be "Good Form", "Bad Form", or "Neutral"
         self.rep_detected = False
         self.last_angle = 0
-        self.confidence_threshold = 0.0  # For motion validation
+        self.confidence_threshold = self.CONFIDENCE_THRESHOLD
         self.motion_history = []  # To track the pattern of movement
+        # Ring buffers of the last HISTORY_LEN positions used by movement validation;
+        # *_head is the next slot to write, *_filled how many slots hold data
+        self.wrist_y_history = np.empty(self.HISTORY_LEN, dtype=np.float32)
+        self._wy_head = 0
+        self._wy_filled = 0
+        self.elbow_position_history = np.empty((self.HISTORY_LEN, 2), dtype=np.float32)
+        self._ep_head = 0
+        self._ep_filled = 0
+        self._lm = None  # Current frame's landmarks as a (33, 3) array
+        # What the last process_frame drew, so draw_overlay can repeat it:
+        # 0 nothing, 1 the joint angle only, 2 the angle plus the rep HUD
+        self._overlay_level = 0
+        self._angle_pos = (0, 0)
+        self._bar_height = 350.0
         
         # Set exercise-specific parameters
         self._configure_exercise_params()
         
+        # Pre-render the static parts of the on-screen overlay
+        self._build_hud()
+        
+    def _build_hud(self):
+        """Pre-render the static overlay (progress bar outline) and cache its mask"""
+        hud = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.rectangle(hud, (580, 100), (620, 350), (0, 255, 0), 2)
+        
+        # Keep only the bounding box of the drawn pixels so compositing touches a small ROI
+        mask = hud.any(axis=2)
+        ys, xs = np.nonzero(mask)
+        self._hud_roi = (slice(ys.min(), ys.max() + 1), slice(xs.min(), xs.max() + 1))
+        self._hud = hud[self._hud_roi].copy()
+        self._hud_mask = mask[self._hud_roi][..., None]
+        
     def _configure_exercise_params(self):
-        """Set exercise-specific parameters like angles and thresholds"""
-        if self.exercise_type == "push-up":
-            self.low = 70
-            self.high = 160
-            self.confidence_threshold = 0.6
-            # Points for push-ups: Left Shoulder (11), Left Elbow (13), Left Wrist (15)
-            self.points = [11, 13, 15]
-            
-        elif self.exercise_type == "squats":
-            self.low = 70
-            self.high = 160
-            self.confidence_threshold = 0.6
-            # Points for squats: Left Hip (23), Left Knee (25), Left Ankle (27)
-            self.points = [23, 25, 27]
-            
-        elif self.exercise_type == "shoulder-press":
-            self.low = 60
-            self.high = 170
-            self.confidence_threshold = 0.7
-            # Shoulder press points: Left Shoulder (11), Left Elbow (13), Left Wrist (15)
-            self.points = [11, 13, 15]
-            # Direction matters for shoulder press (vertical movement)
-            self.vertical_movement = True
-            
-        elif self.exercise_type == "lateral-rise":
-            self.low = 80
-            self.high = 140
-            self.confidence_threshold = 0.7
-            # Points for lateral raise: Left Shoulder (11), Left Elbow (13), Left Wrist (15)
-            self.points = [11, 13, 15]
-            # Lateral raise requires specific sideways movement
-            self.horizontal_movement = True
-            
-        elif self.exercise_type == "barbell-row":
-            self.low = 70
-            self.high = 150
-            self.confidence_threshold = 0.6
-            # Points for barbell row: Left Shoulder (11), Left Elbow (13), Left Wrist (15)
-            self.points = [11, 13, 15]
-            
-        elif self.exercise_type == "tricep-dips":
-            self.low = 70
-            self.high = 160
-            self.confidence_threshold = 0.6
-            # Points for tricep dips: Left Shoulder (11), Left Elbow (13), Left Wrist (15)
-            self.points = [11, 13, 15]
-            
-        elif self.exercise_type == "alt-dumbbell-curls":
-            self.low = 50
-            self.high = 160
-            self.confidence_threshold = 0.7
-            # Points for bicep curls: Left Shoulder (11), Left Elbow (13), Left Wrist (15)
-            self.points = [11, 13, 15]
-        else:
-            # Default
-            self.points = [11, 13, 15]
+        """Precompute values derived from the exercise parameters"""
+        # Warm the text size cache with every string the overlay can display
+        self._warning_text = f"Detected: Not {self.exercise_type.replace('-', ' ')}"
+        for quality in ("Good Form", "Bad Form", "Neutral", "Wrong Exercise"):
+            self._text_size(quality, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)
+        self._text_size(self._warning_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)
+        # Warning at the bottom on a dark red background
+        self._warning_panel = self._render_panel(self._warning_text, 0.9, (255, 255, 255),
+                                                 (0, 0, 80), 420, 460, 450)
+        
+        # Precompute the linear angle -> percentage / bar height mappings
+        # (cheaper per frame than going through np.interp for a scalar)
+        span = self.high - self.low
+        self._per_slope = 100.0 / span
+        self._bar_slope = (100.0 - 350.0) / span
     
-    def _validate_movement(self, lmList):
+    def _text_size(self, text, font, scale, thickness):
+        """Return cv2.getTextSize(...)[0] for the given text, memoized per class"""
+        key = (text, font, scale, thickness)
+        size = self._TEXT_SIZE_CACHE.get(key)
+        if size is None:
+            size = cv2.getTextSize(text, font, scale, thickness)[0]
+            self._TEXT_SIZE_CACHE[key] = size
+        return size
+
+    def _render_panel(self, text, scale, text_color, bg_color, top, bottom, baseline):
+        """
+        Render a horizontally centered label on a filled box.
+        
+        The text stays inside the box, so copying the box's pixels onto a frame
+        gives exactly the same result as drawing the rectangle and text on it.
+        
+        Returns:
+            tuple: (roi, pixels) where roi is a (rows, cols) pair of slices
+        """
+        text_width = self._text_size(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)[0]
+        x0, x1 = 320 - text_width//2 - 10, 320 + text_width//2 + 10  # Add padding
+        canvas = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.rectangle(canvas, (x0, top), (x1, bottom), bg_color, -1)  # Filled rectangle
+        cv2.putText(canvas, text, (320 - text_width//2, baseline),  # Center text
+                    cv2.FONT_HERSHEY_SIMPLEX, scale, text_color, 2)
+        roi = (slice(top, bottom + 1), slice(x0, x1 + 1))
+        return roi, canvas[roi].copy()
+    
+    def _form_panel(self, form_quality):
+        """Return the cached (roi, pixels) panel showing a form quality label"""
+        panel = self._FORM_PANEL_CACHE.get(form_quality)
+        if panel is None:
+            panel = self._render_panel(form_quality, 0.8,
+                                       _FORM_COLORS.get(form_quality, (255, 255, 255)),
+                                       _BG_COLORS.get(form_quality, (0, 0, 0)), 30, 70, 58)
+            self._FORM_PANEL_CACHE[form_quality] = panel
+        return panel
+
+    def _validate_movement(self, lm):
         """
         Validate that the movement matches the expected pattern for the exercise.
         
+        Exercises without a specific movement check accept any movement.
+        
         Args:
-            lmList: List of landmarks from pose detection
+            lm: (33, 3) array of [id, x, y] landmarks from pose detection
             
         Returns:
             bool: True if movement pattern is valid for the exercise, False otherwise
         """
-        is_valid = True
+        return True
+
+    def _compute_feedback(self, angle):
+        """
+        Return (suggestion, form_quality) for the current joint angle.
         
-        if self.exercise_type == "shoulder-press":
-            # For shoulder press, check that wrists move significantly upward
-            # Check if wrist is moving vertically above elbow
-            if len(lmList) > 15:  # Ensure we have wrist and shoulder points
-                wrist = lmList[15][1:3]  # Wrist position
-                elbow = lmList[13][1:3]  # Elbow position
-                shoulder = lmList[11][1:3]  # Shoulder position
-                
-                # Store motion history for shoulder press validation
-                if not hasattr(self, 'wrist_y_history'):
-                    self.wrist_y_history = []
-                
-                # Add current wrist Y position to history
-                self.wrist_y_history.append(wrist[1])
-                if len(self.wrist_y_history) > 10:
-                    self.wrist_y_history.pop(0)
-                
-                # For shoulder press:
-                # 1. Wrists must go above shoulders at the top
-                # 2. Wrists must move vertically (not primarily horizontally like in bicep curls)
-                # 3. Arms must extend fully overhead at the top position
-                
-                # Detect if movement pattern matches bicep curl
-                # In bicep curls, wrist stays below shoulder height and moves toward shoulder
-                if len(self.wrist_y_history) > 5:
-                    # Check if wrist stays below shoulder level (typical for bicep curl)
-                    if all(y > shoulder[1] for y in self.wrist_y_history):
-                        is_valid = False
-                        self.suggestion = "This looks like a bicep curl, not a shoulder press"
-                
-                # When at top position, wrist should be above shoulder for shoulder press
-                if self.angle < 80:  # At the top position
-                    if not (wrist[1] < shoulder[1]):
-                        is_valid = False
-                        self.suggestion = "Extend arms upward for shoulder press"
-                
-        elif self.exercise_type == "alt-dumbbell-curls":
-            # For bicep curls, elbow should remain relatively fixed
-            if len(lmList) > 15:
-                shoulder = lmList[11][1:3]  # Shoulder position
-                elbow = lmList[13][1:3]  # Elbow position
-                wrist = lmList[15][1:3]  # Wrist position
-                
-                # Store elbow position history if not already done
-                if not hasattr(self, 'elbow_position_history'):
-                    self.elbow_position_history = []
-                    
-                # Add current elbow position to history
-                self.elbow_position_history.append(elbow)
-                if len(self.elbow_position_history) > 10:
-                    self.elbow_position_history.pop(0)
-                    
-                # Calculate change in elbow position
-                elbow_x_change = abs(elbow[0] - self.last_elbow_x) if hasattr(self, 'last_elbow_x') else 0
-                
-                # For curls, wrist should move toward shoulder while elbow stays fixed
-                if elbow_x_change > 30:  # Elbow moving too much horizontally
-                    is_valid = False
-                    self.suggestion = "Keep elbow fixed for bicep curls"
-                
-                # Check if wrist goes above elbow (not typical in curls)
-                if wrist[1] < elbow[1] - 50:  # Wrist significantly above elbow
-                    is_valid = False
-                    self.suggestion = "Keep wrist movement in front of body for curls"
-                
-                # Store current position for next comparison
-                self.last_elbow_x = elbow[0]
-                
-        return is_valid
+        This generic fallback is used for exercises without a dedicated tracker.
+        """
+        return "Maintain proper form throughout", "Neutral"
 
     def process_frame(self, img, lmList, detector):
         """
         Process a video frame to track exercise form and reps.
         
+        Reps are counted with hysteresis on self.dir:
+        - dir 0 -> 1 when the range of motion drops to <= 5% (bottom reached)
+        - dir 1 -> 0 when it climbs back to >= 95%, counting one rep
+        
         Args:
             img: Input video frame
-            lmList: List of landmarks from pose detection
-            detector: PoseDetector instance
+            lmList: Landmarks from pose detection, as [id, x, y] rows (list or
+                PoseDetector.findPositionArray() array), or None if no pose was found
+            detector: PoseDetector instance (unused; angles are computed from lmList)
             
         Returns:
             img: Processed image with visualization
         """
         self.suggestion = ""  # Reset suggestion each frame
         self.form_quality = "Neutral"
+        self._overlay_level = 0
         
-        if not lmList or len(lmList) < 33:
+        if lmList is None or len(lmList) < 33:
             self.suggestion = "Make sure your body is visible to the camera."
             return img
+        
+        # Convert the landmarks to a single int array once per frame (a no-op
+        # for findPositionArray output); the validators then read zero-copy
+        # views like self._lm[15, 1:3]
+        self._lm = np.asarray(lmList, dtype=np.int32)
             
-        # Get the specific angle for this exercise using the configured points
-        if len(self.points) == 3:
-            self.angle = detector.findAngle(img, self.points[0], self.points[1], self.points[2])
+        # Get the specific angle for this exercise using the configured points,
+        # along with its rep percentage and bar height, in one compiled call
+        p1, p2, p3 = self.points
+        self.angle, per, bar_height = _analyze(self._lm, p1, p2, p3, float(self.low),
+                                               self._per_slope, self._bar_slope)
+        self.per = per
+        self._bar_height = bar_height
+        self._angle_pos = (int(self._lm[p2, 1]) - 50, int(self._lm[p2, 2]) + 50)
+        self._overlay_level = 1
         
         # Validate the movement pattern is correct for this exercise
-        is_valid_movement = self._validate_movement(lmList)
+        is_valid_movement = self._validate_movement(self._lm)
         if not is_valid_movement:
             self.form_quality = "Wrong Exercise"
             if not self.suggestion:
                 self.suggestion = f"This doesn't look like a {self.exercise_type.replace('-', ' ')}"
-            return img  # Skip rep counting if wrong movement
+            return self.draw_overlay(img)  # Skip rep counting if wrong movement
 
         # Process specific exercise feedback
-        if self.exercise_type == "push-up":
-            if self.angle < 80:
-                self.suggestion = "Bend your arms more to go lower!"
-                self.form_quality = "Bad Form"
-            elif self.angle > 150:
-                self.suggestion = "Straighten your elbows at the top!"
-                self.form_quality = "Good Form"
-            elif self.angle > 90 and self.angle < 120:
-                self.suggestion = "Keep your back straight, not too high or low"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Maintain controlled movement"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "squats":
-            if self.angle < 80:
-                self.suggestion = "Go deeper, bend your knees more"
-                self.form_quality = "Good Form" 
-            elif self.angle > 150:
-                self.suggestion = "Stand tall, keep core engaged"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Keep knees aligned with toes"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "shoulder-press":
-            if self.angle < 70:
-                self.suggestion = "Lower the weights more, full range of motion"
-                self.form_quality = "Good Form"
-            elif self.angle > 160:
-                self.suggestion = "Extend arms fully overhead"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Press weights directly overhead"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "lateral-rise":
-            if self.angle < 90:
-                self.suggestion = "Raise arms to shoulder height"
-                self.form_quality = "Bad Form"
-            elif self.angle > 110:
-                self.suggestion = "Don't raise arms too high"
-                self.form_quality = "Bad Form"
-            else:
-                self.suggestion = "Perfect height, maintain control"
-                self.form_quality = "Good Form"
-                
-        elif self.exercise_type == "barbell-row":
-            if self.angle < 80:
-                self.suggestion = "Pull barbell closer to your body"
-                self.form_quality = "Good Form"
-            elif self.angle > 130:
-                self.suggestion = "Lower the weight with control"
-                self.form_quality = "Neutral"
-            else:
-                self.suggestion = "Keep your back straight"
-                self.form_quality = "Good Form"
-                
-        elif self.exercise_type == "tricep-dips":
-            if self.angle < 70:
-                self.suggestion = "Go deeper for full tricep engagement"
-                self.form_quality = "Good Form"
-            elif self.angle > 150:
-                self.suggestion = "Straighten arms completely at top"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Keep elbows close to body"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "alt-dumbbell-curls":
-            if self.angle < 60:
-                self.suggestion = "Curl the weight fully to shoulder"
-                self.form_quality = "Good Form"
-            elif self.angle > 160:
-                self.suggestion = "Extend arm fully between reps"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Keep elbow fixed by your side"
-                self.form_quality = "Neutral"
-        else:
-            # Generic fallback for any other exercise
-            self.suggestion = "Maintain proper form throughout"
-            self.form_quality = "Neutral"
-
-        per = np.interp(self.angle, (self.low, self.high), (0, 100))
-        bar = np.interp(self.angle, (self.low, self.high), (650, 100))
-
-        # Only count reps if we've verified this is the correct exercise movement
+        self.suggestion, self.form_quality = self._compute_feedback(self.angle)
+
+        # Only count reps if we've verified this is the correct exercise movement.
+        # The 95%/5% hysteresis band tolerates landmark jitter near the ends of
+        # the range instead of requiring an exact 100%/0%.
         if self.form_quality != "Wrong Exercise":
-            if per == 100:
-                if self.dir == 1:
-                    self.count += 1
-                    self.dir = 0
-            elif per == 0:
-                if self.dir == 0:
-                    self.dir = 1
+            self.dir, self.count = _tick(per, self.dir, self.count)
 
+        self._overlay_level = 2
+        return self.draw_overlay(img)
+
+    def draw_overlay(self, img):
+        """
+        Draw the overlay (joint angle, rep bar, form text) from the last processed frame.
+        
+        Used by process_frame itself, and on frames where the detector only
+        extrapolated the landmarks so the stream keeps its overlay without
+        re-running the analysis.
+        
+        Args:
+            img: Video frame to draw on
+            
+        Returns:
+            img: The frame with the overlay drawn
+        """
+        if self._overlay_level == 0:
+            return img
+        cv2.putText(img, str(int(self.angle)), self._angle_pos,
+                    cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+        if self._overlay_level == 1:
+            return img
+        
         # Adjust UI for smaller 640x480 resolution
         
         # Draw simpler progress bar on the right side
-        bar_height = np.interp(self.angle, (self.low, self.high), (350, 100))
-        cv2.rectangle(img, (580, 100), (620, 350), (0, 255, 0), 2)
-        cv2.rectangle(img, (580, int(bar_height)), (620, 350), (0, 255, 0), cv2.FILLED)
-        cv2.putText(img, f'{int(per)}%', (560, 80), cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 255), 2)
+        np.copyto(img[self._hud_roi], self._hud, where=self._hud_mask)
+        cv2.rectangle(img, (580, int(self._bar_height)), (620, 350), (0, 255, 0), cv2.FILLED)
+        cv2.putText(img, f'{int(self.per)}%', (560, 80), cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 255), 2)
         
         # Display rep count in top-left
         cv2.putText(img, f'Reps: {int(self.count)}', (20, 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
         
-        # Display form quality with color coding
-        form_color = (255, 255, 255)  # Default white for neutral
-        if self.form_quality == "Good Form":
-            form_color = (0, 255, 0)  # Green for good form
-        elif self.form_quality == "Bad Form":
-            form_color = (0, 0, 255)  # Red for bad form
-        elif self.form_quality == "Wrong Exercise":
-            form_color = (0, 0, 255)  # Red for wrong exercise
-            
-        # Display text based on form quality
-        display_text = self.form_quality
-        
-        # Simplified form quality display - just text with colored background
-        text_size = cv2.getTextSize(display_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
-        text_width = text_size[0] + 20  # Add padding
-        
-        # Draw background rectangle for text
-        bg_color = (0, 0, 0)  # Default black background
+        # Form quality label and, for a wrong exercise, the warning at the bottom.
+        # Both are fixed per label, so they are copied in from pre-rendered panels.
+        roi, panel = self._form_panel(self.form_quality)
+        img[roi] = panel
         if self.form_quality == "Wrong Exercise":
-            bg_color = (0, 0, 128)  # Darker red background for wrong exercise
-        
-        cv2.rectangle(img, 
-                     (320 - text_width//2, 30), 
-                     (320 + text_width//2, 70), 
-                     bg_color, 
-                     -1)  # Filled rectangle
-                     
-        # Draw the form quality text
-        cv2.putText(img, 
-                   display_text, 
-                   (320 - text_size[0]//2, 58),  # Center text
-                   cv2.FONT_HERSHEY_SIMPLEX, 
-                   0.8, 
-                   form_color, 
-                   2)
-                   
-        # If wrong exercise is detected, also show a more prominent warning
-        if self.form_quality == "Wrong Exercise":
-            # Add a warning message at the bottom
-            warning_text = f"Detected: Not {self.exercise_type.replace('-', ' ')}"
-            warning_size = cv2.getTextSize(warning_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
-            
-            # Warning at the bottom with transparent background
-            cv2.rectangle(img, 
-                         (320 - warning_size[0]//2 - 10, 420), 
-                         (320 + warning_size[0]//2 + 10, 460), 
-                         (0, 0, 80), 
-                         -1)  # Filled rectangle
-                         
-            cv2.putText(img, 
-                       warning_text, 
-                       (320 - warning_size[0]//2, 450),  # Center text
-                       cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.9, 
-                       (255, 255, 255), 
-                       2)
+            roi, panel = self._warning_panel
+            img[roi] = panel
         
         return img
 
@@ -396,4 +355,228 @@ class ExerciseTracker:
         Returns:
             str: Current suggestion for improving form
         """
-        return self.suggestion
\ No newline at end of file
+        return self.suggestion
+
+
+class PushUpTracker(ExerciseTracker):
+    """Push-up tracker using the left shoulder-elbow-wrist angle"""
+    
+    EXERCISE_TYPE = "push-up"
+    CONFIDENCE_THRESHOLD = 0.6
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current push-up angle"""
+        if angle < 80:
+            return "Bend your arms more to go lower!", "Bad Form"
+        elif angle > 150:
+            return "Straighten your elbows at the top!", "Good Form"
+        elif angle > 90 and angle < 120:
+            return "Keep your back straight, not too high or low", "Good Form"
+        return "Maintain controlled movement", "Neutral"
+
+
+class SquatTracker(ExerciseTracker):
+    """Squat tracker using the left hip-knee-ankle angle"""
+    
+    EXERCISE_TYPE = "squats"
+    CONFIDENCE_THRESHOLD = 0.6
+    # Left Hip (23), Left Knee (25), Left Ankle (27)
+    POINTS = (23, 25, 27)
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current squat angle"""
+        if angle < 80:
+            return "Go deeper, bend your knees more", "Good Form"
+        elif angle > 150:
+            return "Stand tall, keep core engaged", "Good Form"
+        return "Keep knees aligned with toes", "Neutral"
+
+
+class ShoulderPressTracker(ExerciseTracker):
+    """Shoulder press tracker that also rejects curl-like movement"""
+    
+    EXERCISE_TYPE = "shoulder-press"
+    LOW = 60
+    HIGH = 170
+    CONFIDENCE_THRESHOLD = 0.7
+    # Direction matters for shoulder press (vertical movement)
+    vertical_movement = True
+    
+    def _validate_movement(self, lm):
+        """
+        Validate that the movement matches a shoulder press rather than a curl.
+        
+        Args:
+            lm: (33, 3) array of [id, x, y] landmarks from pose detection
+            
+        Returns:
+            bool: True if movement pattern is valid for the exercise, False otherwise
+        """
+        is_valid = True
+        
+        # For shoulder press, check that wrists move significantly upward
+        # Check if wrist is moving vertically above elbow
+        if len(lm) > 15:  # Ensure we have wrist and shoulder points
+            wrist = lm[15, 1:3]  # Wrist position
+            shoulder = lm[11, 1:3]  # Shoulder position
+            
+            # Add current wrist Y position to history, overwriting the oldest
+            self.wrist_y_history[self._wy_head] = wrist[1]
+            self._wy_head = (self._wy_head + 1) % self.HISTORY_LEN
+            self._wy_filled = min(self._wy_filled + 1, self.HISTORY_LEN)
+            
+            # For shoulder press:
+            # 1. Wrists must go above shoulders at the top
+            # 2. Wrists must move vertically (not primarily horizontally like in bicep curls)
+            # 3. Arms must extend fully overhead at the top position
+            
+            # Detect if movement pattern matches bicep curl
+            # In bicep curls, wrist stays below shoulder height and moves toward shoulder
+            if self._wy_filled > 5:
+                # Check if wrist stays below shoulder level (typical for bicep curl)
+                if np.all(self.wrist_y_history[:self._wy_filled] > shoulder[1]):
+                    is_valid = False
+                    self.suggestion = "This looks like a bicep curl, not a shoulder press"
+            
+            # When at top position, wrist should be above shoulder for shoulder press
+            if self.angle < 80:  # At the top position
+                if not (wrist[1] < shoulder[1]):
+                    is_valid = False
+                    self.suggestion = "Extend arms upward for shoulder press"
+        
+        return is_valid
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current shoulder press angle"""
+        if angle < 70:
+            return "Lower the weights more, full range of motion", "Good Form"
+        elif angle > 160:
+            return "Extend arms fully overhead", "Good Form"
+        return "Press weights directly overhead", "Neutral"
+
+
+class LateralRiseTracker(ExerciseTracker):
+    """Lateral raise tracker using the left shoulder-elbow-wrist angle"""
+    
+    EXERCISE_TYPE = "lateral-rise"
+    LOW = 80
+    HIGH = 140
+    CONFIDENCE_THRESHOLD = 0.7
+    # Lateral raise requires specific sideways movement
+    horizontal_movement = True
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current lateral raise angle"""
+        if angle < 90:
+            return "Raise arms to shoulder height", "Bad Form"
+        elif angle > 110:
+            return "Don't raise arms too high", "Bad Form"
+        return "Perfect height, maintain control", "Good Form"
+
+
+class BarbellRowTracker(ExerciseTracker):
+    """Barbell row tracker using the left shoulder-elbow-wrist angle"""
+    
+    EXERCISE_TYPE = "barbell-row"
+    HIGH = 150
+    CONFIDENCE_THRESHOLD = 0.6
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current barbell row angle"""
+        if angle < 80:
+            return "Pull barbell closer to your body", "Good Form"
+        elif angle > 130:
+            return "Lower the weight with control", "Neutral"
+        return "Keep your back straight", "Good Form"
+
+
+class TricepDipsTracker(ExerciseTracker):
+    """Tricep dips tracker using the left shoulder-elbow-wrist angle"""
+    
+    EXERCISE_TYPE = "tricep-dips"
+    CONFIDENCE_THRESHOLD = 0.6
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current tricep dip angle"""
+        if angle < 70:
+            return "Go deeper for full tricep engagement", "Good Form"
+        elif angle > 150:
+            return "Straighten arms completely at top", "Good Form"
+        return "Keep elbows close to body", "Neutral"
+
+
+class DumbbellCurlTracker(ExerciseTracker):
+    """Alternating dumbbell curl tracker that checks the elbow stays fixed"""
+    
+    EXERCISE_TYPE = "alt-dumbbell-curls"
+    LOW = 50
+    CONFIDENCE_THRESHOLD = 0.7
+    
+    def _validate_movement(self, lm):
+        """
+        Validate that the movement matches a bicep curl (elbow kept fixed).
+        
+        Args:
+            lm: (33, 3) array of [id, x, y] landmarks from pose detection
+            
+        Returns:
+            bool: True if movement pattern is valid for the exercise, False otherwise
+        """
+        is_valid = True
+        
+        # For bicep curls, elbow should remain relatively fixed
+        if len(lm) > 15:
+            elbow = lm[13, 1:3]  # Elbow position
+            wrist = lm[15, 1:3]  # Wrist position
+            
+            # Add current elbow position to history, overwriting the oldest
+            self.elbow_position_history[self._ep_head] = elbow
+            self._ep_head = (self._ep_head + 1) % self.HISTORY_LEN
+            self._ep_filled = min(self._ep_filled + 1, self.HISTORY_LEN)
+                
+            # Calculate change in elbow position
+            elbow_x_change = abs(elbow[0] - self.last_elbow_x) if hasattr(self, 'last_elbow_x') else 0
+            
+            # For curls, wrist should move toward shoulder while elbow stays fixed
+            if elbow_x_change > 30:  # Elbow moving too much horizontally
+                is_valid = False
+                self.suggestion = "Keep elbow fixed for bicep curls"
+            
+            # Check if wrist goes above elbow (not typical in curls)
+            if wrist[1] < elbow[1] - 50:  # Wrist significantly above elbow
+                is_valid = False
+                self.suggestion = "Keep wrist movement in front of body for curls"
+            
+            # Store current position for next comparison
+            self.last_elbow_x = elbow[0]
+            
+        return is_valid
+    
+    def _compute_feedback(self, angle):
+        """Return (suggestion, form_quality) for the current bicep curl angle"""
+        if angle < 60:
+            return "Curl the weight fully to shoulder", "Good Form"
+        elif angle > 160:
+            return "Extend arm fully between reps", "Good Form"
+        return "Keep elbow fixed by your side", "Neutral"
+
+
+# Tracker class for each supported exercise type
+TRACKERS = {
+    cls.EXERCISE_TYPE: cls
+    for cls in (PushUpTracker, SquatTracker, ShoulderPressTracker, LateralRiseTracker,
+                BarbellRowTracker, TricepDipsTracker, DumbbellCurlTracker)
+}
+
+
+def create_tracker(exercise_type):
+    """
+    Create the tracker for an exercise type.
+    
+    Args:
+        exercise_type: The type of exercise to track
+        
+    Returns:
+        ExerciseTracker: The exercise's dedicated tracker, or a generic one for unknown types
+    """
+    return TRACKERS.get(exercise_type, ExerciseTracker)(exercise_type)
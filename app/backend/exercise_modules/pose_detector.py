@@ -2,10 +2,50 @@
 PoseDetector Class for detecting and analyzing human poses using MediaPipe.
 """
 
+import math
+import queue
+import threading
+
 import cv2
 import mediapipe as mp
 import numpy as np
 
+from app.backend.utils.buffer_queue import BufferQueue
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it _angle_deg runs as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# MediaPipe settings for each speed/accuracy trade-off accepted by PoseDetector
+PROFILES = {
+    "fast": {"complexity": 0, "smooth_landmarks": False},  # Lite model
+    "balanced": {"complexity": 1, "smooth_landmarks": True},  # Full model
+    "accurate": {"complexity": 2, "smooth_landmarks": True},  # Heavy model
+}
+
+@njit(cache=True, fastmath=True)
+def _angle_deg(x1, y1, x2, y2, x3, y3):
+    """Angle in degrees (0-180) at (x2, y2) between the points 1 and 3"""
+    angle = math.degrees(math.atan2(y3 - y2, x3 - x2) - math.atan2(y1 - y2, x1 - x2))
+    if angle < 0.0:
+        angle += 360.0
+    return 360.0 - angle if angle > 180.0 else angle
+
+# MediaPipe Pose graphs keyed by their settings. Loading the model is the slow
+# part of creating a PoseDetector, so later sessions in the same process reuse
+# the graph. One graph must not be driven by two threads at once; the app only
+# runs one detector at a time.
+_POSE_CACHE = {}
+
+# findAngle refreshes each angle label at most every this many calls (~10 Hz at
+# 30 fps); the cached label is still drawn on every frame so it never flickers
+_LABEL_REFRESH_FRAMES = 3
+
 class PoseDetector:
     """
     A class for detecting and analyzing human poses using the MediaPipe library.
@@ -21,22 +61,140 @@ class PoseDetector:
         mp_draw: MediaPipe drawing utilities
     """
     
-    def __init__(self, mode=False, complexity=1, smooth_landmarks=True, 
-                 enable_segmentation=False, smooth_segmentation=True):
+    def __init__(self, mode=False, complexity=None, smooth_landmarks=None, 
+                 enable_segmentation=False, smooth_segmentation=True, profile="balanced",
+                 inference_width=640, threaded=False, infer_every=1, min_visibility=0.7):
         """
         Initialize the PoseDetector with MediaPipe pose detection.
         
         Args:
             mode: Whether to treat the input images as a batch or not.
-            complexity: Model complexity (0=Lite, 1=Full, 2=Heavy)
-            smooth_landmarks: Whether to filter landmarks across frames
+            complexity: Model complexity (0=Lite, 1=Full, 2=Heavy), overrides the profile
+            smooth_landmarks: Whether to filter landmarks across frames, overrides the profile
             enable_segmentation: Whether to generate segmentation mask
             smooth_segmentation: Whether to filter segmentation mask across frames
+            profile: "fast", "balanced" or "accurate" (see PROFILES)
+            inference_width: Wider frames are downscaled to this width before inference
+            threaded: Run inference on a background thread; findPose then returns
+                the newest available result, typically from the previous frame
+            infer_every: Run inference on every Nth call to findPose and extrapolate
+                the landmarks in between
+            min_visibility: Below this nose visibility inference runs on every call
         """
+        settings = PROFILES[profile]
+        if complexity is None:
+            complexity = settings["complexity"]
+        if smooth_landmarks is None:
+            smooth_landmarks = settings["smooth_landmarks"]
+        
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(mode, complexity, smooth_landmarks, 
-                                      enable_segmentation, smooth_segmentation)
+        # Segmentation smoothing only matters when a mask is produced at all
+        self.pose = self._create_pose(mode, complexity, smooth_landmarks, enable_segmentation,
+                                      enable_segmentation and smooth_segmentation)
         self.mp_draw = mp.solutions.drawing_utils
+        self.set_drawn_landmarks(None)
+        self._lm_px = None  # Pixel coordinates of the last detected landmarks
+        # Mask of landmarks the model reported (visibility > 0), or None when all
+        # were; backends that predict fewer points (RTMPose) leave the rest at
+        # (0, 0) with zero visibility
+        self._lm_visible = None
+        self._rgb_buf = None  # Reused destination for the BGR -> RGB conversion
+        self._angle_labels = {}  # (p1, p2, p3) -> [label text, calls since refresh]
+        self.inference_width = inference_width
+        
+        # Adaptive inference skipping; self.inferred tells callers whether the
+        # last findPose call ran the model or extrapolated the landmarks
+        self.infer_every = infer_every
+        self.min_visibility = min_visibility
+        self.inferred = False
+        self._frame_idx = 0
+        self._last_infer_idx = 0
+        self._prev_infer_idx = 0
+        self._last_visibility = 0.0
+        self._lm_norm = None  # Normalized landmarks of the last two inferences
+        self._lm_prev = None
+        
+        self.results = None
+        self._worker_thread = None
+        # Sequence ids of the last frame handed to the worker and of the frame
+        # behind self.results, so a result is only cached once
+        self._submitted_seq = 0
+        self._result_seq = 0
+        if threaded:
+            # Single-slot queues: the worker always sees the newest frame and
+            # findPose always picks up the newest result
+            self._in_q = BufferQueue(maxsize=1)
+            self._out_q = BufferQueue(maxsize=1)
+            self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+            self._worker_thread.start()
+
+    def _create_pose(self, mode, complexity, smooth_landmarks, 
+                     enable_segmentation, smooth_segmentation):
+        """
+        Create the pose model used by findPose.
+        
+        Subclasses can return any object exposing a MediaPipe-style
+        process(img_rgb) method to plug in a different pose backend.
+        """
+        key = (mode, complexity, smooth_landmarks, enable_segmentation, smooth_segmentation)
+        pose = _POSE_CACHE.get(key)
+        if pose is None:
+            # Keyword arguments guard against MediaPipe reordering its parameters
+            pose = self.mp_pose.Pose(static_image_mode=mode,
+                                     model_complexity=complexity,
+                                     smooth_landmarks=smooth_landmarks,
+                                     enable_segmentation=enable_segmentation,
+                                     smooth_segmentation=smooth_segmentation)
+            _POSE_CACHE[key] = pose
+        return pose
+
+    def _worker(self):
+        """Run pose inference on frames queued by findPose (background thread)"""
+        while True:
+            item = self._in_q.get()
+            if item is None:
+                break
+            seq, img_rgb = item
+            self._out_q.put((seq, self.pose.process(img_rgb)))
+
+    def close(self):
+        """Stop the inference thread started with threaded=True"""
+        if self._worker_thread is not None:
+            self._in_q.put(None)
+            self._worker_thread.join(timeout=2.0)
+            self._worker_thread = None
+
+    def reset(self):
+        """Forget the previous session's landmarks so the next findPose runs inference"""
+        self.inferred = False
+        self._frame_idx = 0
+        self._last_infer_idx = 0
+        self._prev_infer_idx = 0
+        self._last_visibility = 0.0
+        self._lm_norm = None
+        self._lm_prev = None
+        self._lm_px = None
+        self._lm_visible = None
+        self._angle_labels.clear()
+        self.results = None
+
+    def set_drawn_landmarks(self, points):
+        """
+        Restrict the skeleton drawn by findPose to a chain of landmarks.
+        
+        Drawing only the joints an exercise uses (e.g. [11, 13, 15]) is much
+        cheaper than MediaPipe's full 33-landmark drawing utility.
+        
+        Args:
+            points: Landmark IDs to draw, connected in order, or None for the full skeleton
+        """
+        if points:
+            self.drawn_points = list(points)
+            self.drawn_connections = list(zip(self.drawn_points, self.drawn_points[1:]))
+        else:
+            self.drawn_points = None
+            self.drawn_connections = list(self.mp_pose.POSE_CONNECTIONS)
+        self._connections = np.array(self.drawn_connections, dtype=np.int32).reshape(-1, 2)
 
     def findPose(self, img, draw=True):
         """
@@ -49,34 +207,214 @@ class PoseDetector:
         Returns:
             Image with pose landmarks drawn if draw=True
         """
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.pose.process(img_rgb)
-        if self.results.pose_landmarks and draw:
-            self.mp_draw.draw_landmarks(img, self.results.pose_landmarks, 
-                                        self.mp_pose.POSE_CONNECTIONS)
+        # Joints move little between consecutive frames, so only run the model
+        # every infer_every calls, or whenever the pose is lost or uncertain
+        idx = self._frame_idx
+        self._frame_idx += 1
+        self.inferred = (self._lm_norm is None
+                         or idx - self._last_infer_idx >= self.infer_every
+                         or self._last_visibility < self.min_visibility)
+        if self.inferred:
+            self._run_inference(img, idx)
+        else:
+            self._extrapolate_landmarks(img, idx)
+        
+        if self._lm_px is not None and draw:
+            if self.inferred and self.drawn_points is None:
+                self.mp_draw.draw_landmarks(img, self.results.pose_landmarks, 
+                                            self.mp_pose.POSE_CONNECTIONS)
+            else:
+                self._draw_cached(img)
         return img
 
-    def findPosition(self, img, draw=True):
+    def _run_inference(self, img, idx):
+        """Run the pose model on img and cache the resulting landmarks"""
+        # MediaPipe works on a 256x256 crop internally, so larger frames are only
+        # extra conversion work; landmarks are normalized, so drawing and
+        # findPosition still use the original frame's size
+        src = img
+        h, w = img.shape[:2]
+        if w > self.inference_width:
+            src = cv2.resize(img, (self.inference_width, self.inference_width * h // w),
+                             interpolation=cv2.INTER_AREA)
+        
+        if self._worker_thread is not None:
+            seq, results = self._process_threaded(src)
+            if seq == self._result_seq:
+                # No new result yet; extrapolate instead of feeding the same
+                # landmarks into the history again, which would zero the velocity
+                self.inferred = False
+                if self._lm_norm is not None:
+                    self._extrapolate_landmarks(img, idx)
+                return
+            self._result_seq = seq
+            self.results = results
+        else:
+            # Convert into a persistent buffer instead of allocating a frame per call
+            if self._rgb_buf is None or self._rgb_buf.shape != src.shape:
+                self._rgb_buf = np.empty_like(src)
+            self._rgb_buf.flags.writeable = True
+            cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            # Read-only input lets MediaPipe wrap the buffer without copying it
+            self._rgb_buf.flags.writeable = False
+            self.results = self.pose.process(self._rgb_buf)
+        self._cache_landmarks(img, idx)
+
+    def _process_threaded(self, src):
+        """Hand a frame to the inference thread and return the newest (seq, result) pair"""
+        # The worker may still be reading the previous frame, so convert into a
+        # fresh array rather than the shared buffer
+        img_rgb = cv2.cvtColor(src, cv2.COLOR_BGR2RGB)
+        img_rgb.flags.writeable = False
+        self._submitted_seq += 1
+        self._in_q.put((self._submitted_seq, img_rgb))
+        try:
+            return self._out_q.get_nowait()
+        except queue.Empty:
+            if self.results is None:
+                return self._out_q.get()  # Wait for the very first result
+            # Inference still running; the unchanged seq marks the result as stale
+            return self._result_seq, self.results
+
+    def _cache_landmarks(self, img, idx):
+        """Convert the detected landmarks to pixel coordinates once per inference"""
+        self._prev_infer_idx, self._last_infer_idx = self._last_infer_idx, idx
+        if not self.results.pose_landmarks:
+            self._lm_norm = self._lm_prev = None
+            self._lm_px = None
+            self._lm_visible = None
+            self._last_visibility = 0.0
+            return
+        landmarks = self.results.pose_landmarks.landmark
+        n = len(landmarks)
+        values = np.fromiter((v for lm in landmarks for v in (lm.x, lm.y, lm.visibility)),
+                             dtype=np.float64, count=3 * n).reshape(n, 3)
+        xy = np.ascontiguousarray(values[:, :2])
+        visible = values[:, 2] > 0.0
+        self._lm_visible = None if visible.all() else visible
+        self._last_visibility = landmarks[0].visibility
+        self._lm_prev, self._lm_norm = self._lm_norm, xy
+        self._to_pixels(xy, img)
+
+    def _extrapolate_landmarks(self, img, idx):
+        """Linearly extrapolate the landmarks of the last two inferences to frame idx"""
+        xy = self._lm_norm
+        if self._lm_prev is not None:
+            step = (idx - self._last_infer_idx) / (self._last_infer_idx - self._prev_infer_idx)
+            xy = xy + (xy - self._lm_prev) * step
+        self._to_pixels(xy, img)
+
+    def _to_pixels(self, xy, img):
+        """Scale normalized landmarks to the image size and cache them as int32"""
+        h, w = img.shape[:2]
+        # Truncating cast, matching int(lm.x * w) for on-screen landmarks
+        self._lm_px = np.multiply(xy, (w, h), out=np.empty(xy.shape, dtype=np.int32),
+                                  casting='unsafe')
+
+    def _visible_points(self, ids):
+        """Cached pixel coordinates of the landmarks in ids (all if None), minus unreported ones"""
+        pts = self._lm_px if ids is None else self._lm_px[list(ids)]
+        if self._lm_visible is not None:
+            pts = pts[self._lm_visible if ids is None else self._lm_visible[list(ids)]]
+        return pts
+
+    def _draw_cached(self, img):
+        """Draw the landmarks and connections selected with set_drawn_landmarks from the cache"""
+        connections = self._connections
+        if self._lm_visible is not None:
+            # Skip connections to landmarks the model didn't report, which sit at the origin
+            connections = connections[self._lm_visible[connections].all(axis=1)]
+        if len(connections):
+            cv2.polylines(img, self._lm_px[connections], False, (255, 255, 255), 2)
+        for cx, cy in self._visible_points(self.drawn_points).tolist():
+            cv2.circle(img, (cx, cy), 5, (0, 0, 255), cv2.FILLED)
+
+    def findPosition(self, img, draw=True, joint_ids=None):
         """
         Find the positions of all landmarks in the image.
         
         Args:
             img: Input image
             draw: Whether to draw circles at landmark positions
+            joint_ids: Landmark IDs to draw (e.g. the joints of an angle), or None for all
             
         Returns:
-            List of landmarks with their positions [id, x, y]
+            List of landmarks with their positions [id, x, y]. Landmarks the
+            backend does not predict are (0, 0) sentinels (see landmark_visible)
         """
         lmList = []
-        if self.results.pose_landmarks:
-            for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                h, w, c = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
+        if self._lm_px is not None:
+            # Built from the pixel coordinates cached by findPose
+            for id, (cx, cy) in enumerate(self._lm_px.tolist()):
                 lmList.append([id, cx, cy])
-                if draw:
-                    cv2.circle(img, (cx, cy), 5, (255, 0, 0), cv2.FILLED)
+            if draw:
+                self._draw_joints(img, joint_ids)
         return lmList
 
+    def findPositionArray(self, img, draw=False, joint_ids=None):
+        """
+        Find the positions of all landmarks as a NumPy array.
+        
+        Args:
+            img: Input image
+            draw: Whether to draw circles at landmark positions
+            joint_ids: Landmark IDs to draw, or None for all
+            
+        Returns:
+            (N, 3) int32 array of [id, x, y] rows, or None if no pose was detected.
+            Landmarks the backend does not predict are (0, 0) sentinels; use
+            landmark_visible() to mask them out
+        """
+        if self._lm_px is None:
+            return None
+        n = len(self._lm_px)
+        positions = np.empty((n, 3), dtype=np.int32)
+        positions[:, 0] = np.arange(n)
+        positions[:, 1:] = self._lm_px
+        if draw:
+            self._draw_joints(img, joint_ids)
+        return positions
+
+    def landmark_visible(self):
+        """
+        Return which landmarks of the last pose were actually predicted.
+        
+        Returns:
+            (N,) bool array (True for every landmark with MediaPipe), or None if
+            no pose was detected
+        """
+        if self._lm_px is None:
+            return None
+        if self._lm_visible is None:
+            return np.ones(len(self._lm_px), dtype=bool)
+        return self._lm_visible.copy()
+
+    def _draw_joints(self, img, joint_ids):
+        """Draw a circle at each cached landmark in joint_ids (all landmarks if None)"""
+        for cx, cy in self._visible_points(joint_ids).tolist():
+            cv2.circle(img, (cx, cy), 5, (255, 0, 0), cv2.FILLED)
+
+    def findAngles(self, triples):
+        """
+        Calculate the angles for several landmark triples in one vectorized pass.
+        
+        Args:
+            triples: (K, 3) array of [p1, p2, p3] landmark IDs, p2 being the joint;
+                build it once up front rather than per frame
+            
+        Returns:
+            (K,) array of angles in degrees (zeros if no pose was detected)
+        """
+        triples = np.asarray(triples)
+        if self._lm_px is None:
+            return np.zeros(len(triples))
+        pts = self._lm_px[triples]  # (K, 3, 2)
+        v1 = pts[:, 0] - pts[:, 1]
+        v2 = pts[:, 2] - pts[:, 1]
+        angles = np.abs(np.degrees(np.arctan2(v2[:, 1], v2[:, 0]) - 
+                                   np.arctan2(v1[:, 1], v1[:, 0])))
+        return np.where(angles > 180, 360 - angles, angles)
+
     def findAngle(self, img, p1, p2, p3, draw=True):
         """
         Calculate the angle between three points (landmarks).
@@ -91,21 +429,23 @@ class PoseDetector:
         Returns:
             Angle in degrees
         """
-        lmList = self.findPosition(img, draw=False)
-        if lmList:
-            # Get coordinates of the three points
-            x1, y1 = lmList[p1][1], lmList[p1][2]
-            x2, y2 = lmList[p2][1], lmList[p2][2]
-            x3, y3 = lmList[p3][1], lmList[p3][2]
+        if self._lm_px is not None:
+            # Get coordinates of the three points from the landmarks cached by findPose
+            x1, y1 = self._lm_px[p1].tolist()
+            x2, y2 = self._lm_px[p2].tolist()
+            x3, y3 = self._lm_px[p3].tolist()
 
-            # Calculate the angle
-            angle = np.degrees(np.arctan2(y3 - y2, x3 - x2) - 
-                              np.arctan2(y1 - y2, x1 - x2))
-            angle = angle + 360 if angle < 0 else angle
-            angle = angle if angle <= 180 else 360 - angle
+            # Calculate the angle (compiled with Numba when it is installed)
+            angle = _angle_deg(x1, y1, x2, y2, x3, y3)
 
             if draw:
-                cv2.putText(img, str(int(angle)), (x2 - 50, y2 + 50),
+                # The displayed integer barely changes between frames, so the
+                # label text is only rebuilt every few calls
+                label = self._angle_labels.get((p1, p2, p3))
+                if label is None or label[1] >= _LABEL_REFRESH_FRAMES:
+                    label = self._angle_labels[(p1, p2, p3)] = [str(int(angle)), 0]
+                label[1] += 1
+                cv2.putText(img, label[0], (x2 - 50, y2 + 50),
                             cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
             return angle
         return 0
\ No newline at end of file
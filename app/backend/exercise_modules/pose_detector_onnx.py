@@ -0,0 +1,127 @@
+"""
+ONNX Runtime pose backend for PoseDetector using an RTMPose model.
+"""
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+from mediapipe.framework.formats import landmark_pb2
+
+from app.backend.exercise_modules.pose_detector import PoseDetector
+
+# MediaPipe landmark ID for each of the 17 COCO keypoints RTMPose predicts, so
+# callers can keep using MediaPipe IDs (e.g. 11/13/15 for the left arm)
+_COCO_TO_MEDIAPIPE = (0, 2, 5, 7, 8, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28)
+_NUM_MEDIAPIPE_LANDMARKS = 33
+
+# ImageNet normalisation used by RTMPose, in RGB order
+_MEAN = np.array([123.675, 116.28, 103.53], dtype=np.float32)
+_STD = np.array([58.395, 57.12, 57.375], dtype=np.float32)
+
+
+class RTMPose:
+    """
+    Single-person RTMPose estimator with a MediaPipe-compatible process() method.
+    
+    The whole frame is treated as the person's bounding box, which suits the
+    one-user-in-front-of-a-webcam setup of the exercise tracker.
+    
+    Attributes:
+        session: ONNX Runtime inference session
+        input_size: Model input size as (width, height)
+    """
+    
+    def __init__(self, model_path, num_threads=4, simcc_split_ratio=2.0):
+        """
+        Load the RTMPose ONNX model.
+        
+        Args:
+            model_path: Path to an RTMPose ONNX export (e.g. rtmpose-t.onnx)
+            num_threads: Number of intra-op CPU threads for ONNX Runtime
+            simcc_split_ratio: SimCC bins per input pixel used by the model
+        """
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, sess_options=options,
+                                            providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        _, _, in_h, in_w = model_input.shape  # NCHW
+        self.input_size = (in_w, in_h)
+        self._split_ratio = simcc_split_ratio
+        self._canvas = np.zeros((in_h, in_w, 3), dtype=np.uint8)
+
+    def process(self, img_rgb):
+        """
+        Estimate the pose in an RGB image.
+        
+        Args:
+            img_rgb: Input image (RGB format)
+            
+        Returns:
+            Object with a pose_landmarks NormalizedLandmarkList, like MediaPipe's results
+        """
+        h, w = img_rgb.shape[:2]
+        in_w, in_h = self.input_size
+        
+        # Letterbox the frame into the model input, preserving aspect ratio
+        scale = min(in_w / w, in_h / h)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x, pad_y = (in_w - new_w) // 2, (in_h - new_h) // 2
+        self._canvas.fill(0)
+        self._canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(
+            img_rgb, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        blob = ((self._canvas - _MEAN) / _STD).transpose(2, 0, 1)[None].astype(np.float32)
+        
+        simcc_x, simcc_y = self.session.run(None, {self._input_name: blob})
+        simcc_x, simcc_y = simcc_x[0], simcc_y[0]
+        
+        # Decode SimCC: the arg-max bin per axis is the keypoint location
+        xs = simcc_x.argmax(axis=1) / self._split_ratio
+        ys = simcc_y.argmax(axis=1) / self._split_ratio
+        scores = 0.5 * (simcc_x.max(axis=1) + simcc_y.max(axis=1))
+        
+        # Undo the letterbox and normalise to [0, 1] like MediaPipe
+        xs = (xs - pad_x) / scale / w
+        ys = (ys - pad_y) / scale / h
+        
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for _ in range(_NUM_MEDIAPIPE_LANDMARKS):
+            landmarks.landmark.add(visibility=0.0)
+        for coco_id, mp_id in enumerate(_COCO_TO_MEDIAPIPE):
+            lm = landmarks.landmark[mp_id]
+            lm.x = float(xs[coco_id])
+            lm.y = float(ys[coco_id])
+            lm.visibility = float(np.clip(scores[coco_id], 0.0, 1.0))
+        return SimpleNamespace(pose_landmarks=landmarks)
+
+
+class OnnxPoseDetector(PoseDetector):
+    """
+    PoseDetector that runs an RTMPose ONNX model through ONNX Runtime.
+    
+    Exposes the same findPose/findPosition/findAngle API and MediaPipe
+    landmark IDs as PoseDetector; landmarks RTMPose does not predict
+    (hands, feet, face details) are reported with zero visibility. They are
+    not drawn, and findPosition/findPositionArray return them as (0, 0)
+    sentinels that landmark_visible() masks out.
+    """
+    
+    def __init__(self, model_path, num_threads=4, **kwargs):
+        """
+        Initialize the detector with an RTMPose model.
+        
+        Args:
+            model_path: Path to an RTMPose ONNX export (e.g. rtmpose-t.onnx)
+            num_threads: Number of intra-op CPU threads for ONNX Runtime
+            **kwargs: Passed through to PoseDetector
+        """
+        self.model_path = model_path
+        self.num_threads = num_threads
+        super().__init__(**kwargs)
+
+    def _create_pose(self, *args):
+        """Create the RTMPose estimator instead of a MediaPipe Pose graph"""
+        return RTMPose(self.model_path, self.num_threads)
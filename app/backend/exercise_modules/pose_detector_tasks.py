@@ -0,0 +1,95 @@
+"""
+MediaPipe Tasks pose backend for PoseDetector, with optional GPU inference.
+"""
+
+import time
+from types import SimpleNamespace
+
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+
+from app.backend.exercise_modules.pose_detector import PoseDetector
+
+BaseOptions = mp.tasks.BaseOptions
+PoseLandmarker = mp.tasks.vision.PoseLandmarker
+PoseLandmarkerOptions = mp.tasks.vision.PoseLandmarkerOptions
+RunningMode = mp.tasks.vision.RunningMode
+
+
+class PoseLandmarkerModel:
+    """
+    MediaPipe Tasks PoseLandmarker with a MediaPipe-solutions-compatible process() method.
+    
+    Unlike mp.solutions.pose, the Tasks API can run the BlazePose model on the
+    GPU delegate (Linux and macOS builds of MediaPipe).
+    
+    Attributes:
+        landmarker: The underlying PoseLandmarker, in video running mode
+    """
+
+    def __init__(self, model_path, use_gpu=False):
+        """
+        Load a pose landmarker model bundle.
+        
+        Args:
+            model_path: Path to a .task bundle (e.g. pose_landmarker_lite.task)
+            use_gpu: Run inference on the GPU delegate instead of the CPU
+        """
+        delegate = BaseOptions.Delegate.GPU if use_gpu else BaseOptions.Delegate.CPU
+        options = PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+            running_mode=RunningMode.VIDEO,
+            num_poses=1)
+        self.landmarker = PoseLandmarker.create_from_options(options)
+        self._last_timestamp_ms = -1
+
+    def process(self, img_rgb):
+        """
+        Estimate the pose in an RGB image.
+        
+        Args:
+            img_rgb: Input image (RGB format, contiguous uint8)
+        
+        Returns:
+            Object with a pose_landmarks NormalizedLandmarkList (or None), like MediaPipe's results
+        """
+        # Video mode tracks the pose between calls and needs increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+        result = self.landmarker.detect_for_video(image, timestamp_ms)
+        if not result.pose_landmarks:
+            return SimpleNamespace(pose_landmarks=None)
+        
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for lm in result.pose_landmarks[0]:
+            landmarks.landmark.add(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility or 0.0)
+        return SimpleNamespace(pose_landmarks=landmarks)
+
+
+class TasksPoseDetector(PoseDetector):
+    """
+    PoseDetector that runs BlazePose through the MediaPipe Tasks API.
+    
+    Exposes the same findPose/findPosition/findAngle API and landmark IDs as
+    PoseDetector; the model variant (lite/full/heavy) is chosen by the .task
+    bundle instead of the profile's complexity.
+    """
+
+    def __init__(self, model_path, use_gpu=False, **kwargs):
+        """
+        Initialize the detector with a pose landmarker model bundle.
+        
+        Args:
+            model_path: Path to a .task bundle (e.g. pose_landmarker_lite.task)
+            use_gpu: Run inference on the GPU delegate instead of the CPU
+            **kwargs: Passed through to PoseDetector
+        """
+        self.model_path = model_path
+        self.use_gpu = use_gpu
+        super().__init__(**kwargs)
+
+    def _create_pose(self, *args):
+        """Create the Tasks pose landmarker instead of a MediaPipe solutions graph"""
+        return PoseLandmarkerModel(self.model_path, self.use_gpu)
@@ -0,0 +1,30 @@
+"""
+BufferQueue: a bounded queue that keeps the newest items.
+"""
+
+import queue
+
+
+class BufferQueue(queue.Queue):
+    """
+    A queue.Queue whose put() discards the oldest item instead of blocking when full.
+    
+    With maxsize=1 this is a "latest value" slot between a producer and a
+    consumer: the producer never waits, and the consumer blocks in get()
+    without polling until something newer arrives.
+    """
+    
+    def put(self, item, block=True, timeout=None):
+        """Add item, dropping the oldest queued item if the queue is full"""
+        with self.not_full:
+            if 0 < self.maxsize <= self._qsize():
+                # The dropped item's unfinished task is taken over by the new one
+                self._get()
+            else:
+                self.unfinished_tasks += 1
+            self._put(item)
+            self.not_empty.notify()
+
+    def put_nowait(self, item):
+        """Same as put(); it never blocks"""
+        self.put(item, block=False)
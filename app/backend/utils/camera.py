@@ -0,0 +1,103 @@
+"""
+ThreadedCamera: a webcam reader that keeps the newest frame in memory.
+"""
+
+import threading
+import time
+
+import cv2
+
+
+class ThreadedCamera:
+    """
+    Continuously reads a cv2.VideoCapture on a daemon thread.
+    
+    The reader drains the driver's queue as fast as the camera delivers, so
+    read() never waits on USB I/O for a stale frame; it hands out the newest
+    frame, waiting only until one arrives that the caller hasn't seen yet.
+    
+    Attributes:
+        cap: The underlying cv2.VideoCapture
+    """
+    
+    def __init__(self, src=0, api_preference=cv2.CAP_ANY, width=640, height=480, fps=30):
+        """
+        Open the camera and start the reader thread.
+        
+        Args:
+            src: Camera index or video source passed to cv2.VideoCapture
+            api_preference: OpenCV capture backend (e.g. cv2.CAP_DSHOW on Windows)
+            width: Requested frame width
+            height: Requested frame height
+            fps: Requested frame rate
+        """
+        self.cap = cv2.VideoCapture(src, api_preference)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep latency low (not honoured by every backend)
+        
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_id = 0  # Incremented for every frame the reader stores
+        self._last_read_id = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+        self._thread.start()
+
+    @property
+    def frame_size(self):
+        """The (width, height) the camera actually delivers"""
+        return (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    def isOpened(self):
+        """Whether the underlying capture device is open"""
+        return self.cap.isOpened()
+
+    def _reader(self):
+        """Read frames until released (runs on its own thread)"""
+        while self._running:
+            success, frame = self.cap.read()
+            if not success:
+                # Device gone or not ready; wake waiting readers so they can time out
+                with self._cond:
+                    self._cond.notify_all()
+                if not self.cap.isOpened():
+                    break
+                time.sleep(0.01)
+                continue
+            with self._cond:
+                self._frame = frame
+                self._frame_id += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        """
+        Return the newest frame, waiting for one newer than the last read.
+        
+        cap.read() allocates a new array per frame, so the returned frame is
+        never overwritten by the reader and can be drawn on freely.
+        
+        Args:
+            timeout: Seconds to wait for a new frame
+            
+        Returns:
+            tuple: (success, frame), like cv2.VideoCapture.read()
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frame_id != self._last_read_id or not self._running,
+                                       timeout=timeout):
+                return False, None
+            if self._frame_id == self._last_read_id:
+                return False, None  # Released while waiting
+            self._last_read_id = self._frame_id
+            return True, self._frame
+
+    def release(self):
+        """Stop the reader thread and release the camera"""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+        self.cap.release()
@@ -5,30 +5,56 @@ This module provides functions to connect to the MySQL database
 and perform CRUD operations on the user data and workout logs.
 """
 
-import mysql.connector
+import threading
+
 from mysql.connector import Error
+from mysql.connector.pooling import MySQLConnectionPool
+
+# Shared connection pool, created on first use so importing this module does
+# not require a running database. The lock keeps concurrent first requests
+# (threaded dev server, gunicorn gthread) from each building a 'fitpose' pool.
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """Return the connection pool, creating it on first use"""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            # Re-check: another thread may have created it while we waited
+            if _POOL is None:
+                _POOL = MySQLConnectionPool(
+                    pool_name='fitpose',
+                    pool_size=8,
+                    host='localhost',
+                    user='root',
+                    password='',
+                    database='smart_gym_trainer'
+                )
+    return _POOL
+
 
 def create_connection():
     """
-    Create a connection to the MySQL database.
+    Get a connection to the MySQL database from the connection pool.
+    
+    Pooled connections skip the TCP connect and MySQL handshake; calling
+    close() on them returns them to the pool.
     
     Returns:
         connection: MySQL database connection object if successful, None otherwise
     """
     connection = None
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',
-            passwd='',
-            database='smart_gym_trainer'
-        )
+        connection = _get_pool().get_connection()
         print("Connection to MySQL DB successful")
     except Error as e:
         print(f"The error '{e}' occurred")
     
     return connection
 
+
 def execute_query(connection, query, params=None):
     """
     Execute a SQL query on the database.
@@ -41,7 +67,9 @@ def execute_query(connection, query, params=None):
     Returns:
         bool: True if query executed successfully, False otherwise
     """
-    cursor = connection.cursor()
+    # Parameterized statements go through a prepared cursor, so the server
+    # parses the SQL once and only the parameters are sent on execution
+    cursor = connection.cursor(prepared=True) if params else connection.cursor()
     try:
         if params:
             cursor.execute(query, params)
@@ -56,6 +84,7 @@ def execute_query(connection, query, params=None):
     finally:
         cursor.close()
 
+
 def execute_read_query(connection, query, params=None):
     """
     Execute a read query on the database.
@@ -68,7 +97,7 @@ def execute_read_query(connection, query, params=None):
     Returns:
         list: Result of the query as a list of tuples, None if error occurs
     """
-    cursor = connection.cursor()
+    cursor = connection.cursor(prepared=True) if params else connection.cursor()
     result = None
     try:
         if params:
@@ -81,4 +110,50 @@ def execute_read_query(connection, query, params=None):
         print(f"The error '{e}' occurred")
         return None
     finally:
-        cursor.close()
\ No newline at end of file
+        cursor.close()
+
+
+def execute_many(connection, query, seq_of_params):
+    """
+    Execute a SQL statement once for each set of parameters in a single batch.
+    
+    For INSERT statements the driver rewrites the batch into one multi-row
+    INSERT, so buffered rows (e.g. one per rep) cost a single round trip.
+    
+    Args:
+        connection: MySQL database connection
+        query: SQL query string with placeholders
+        seq_of_params: Sequence of parameter tuples, one per row
+        
+    Returns:
+        bool: True if the batch executed successfully, False otherwise
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.executemany(query, seq_of_params)
+        connection.commit()
+        print(f"Batch of {cursor.rowcount} rows executed successfully")
+        return True
+    except Error as e:
+        print(f"The error '{e}' occurred")
+        return False
+    finally:
+        cursor.close()
+
+
+def insert_workout_logs(connection, rows):
+    """
+    Insert buffered workout log rows in one batch.
+    
+    Args:
+        connection: MySQL database connection
+        rows: Sequence of (user_id, exercise_name, weights_lifted, repetitions, log_date) tuples
+        
+    Returns:
+        bool: True if the rows were inserted successfully, False otherwise
+    """
+    if not rows:
+        return True
+    query = ("INSERT INTO WorkoutLogs (user_id, exercise_name, weights_lifted, repetitions, log_date) "
+             "VALUES (%s, %s, %s, %s, %s)")
+    return execute_many(connection, query, rows)
@@ -3,13 +3,27 @@ import mediapipe as mp
 import numpy as np
 
 class PoseDetector:
-    def __init__(self, mode=False, complexity=1, smooth_landmarks=True, enable_segmentation=False, smooth_segmentation=True):
+    def __init__(self, mode=False, complexity=1, smooth_landmarks=False, enable_segmentation=False, smooth_segmentation=True,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(mode, complexity, smooth_landmarks, enable_segmentation, smooth_segmentation)
+        # Rep counting only needs one joint angle per frame, so landmark smoothing is off by
+        # default and segmentation smoothing only applies when a mask is requested at all
+        self.pose = self.mp_pose.Pose(static_image_mode=mode,
+                                      model_complexity=complexity,
+                                      smooth_landmarks=smooth_landmarks,
+                                      enable_segmentation=enable_segmentation,
+                                      smooth_segmentation=enable_segmentation and smooth_segmentation,
+                                      min_detection_confidence=min_detection_confidence,
+                                      min_tracking_confidence=min_tracking_confidence)
         self.mp_draw = mp.solutions.drawing_utils
+        # Reused destination for the BGR -> RGB conversion; shared by every caller,
+        # so concurrent findPose calls must be serialized by the caller
+        self._rgb_buf = None
 
     def findPose(self, img, draw=True):
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        if self._rgb_buf is None or self._rgb_buf.shape != img.shape:
+            self._rgb_buf = np.empty_like(img)
+        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
         self.results = self.pose.process(img_rgb)
         if self.results.pose_landmarks and draw:
             self.mp_draw.draw_landmarks(img, self.results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS)
@@ -18,8 +32,8 @@ class PoseDetector:
     def findPosition(self, img, draw=True):
         lmList = []
         if self.results.pose_landmarks:
+            h, w = img.shape[:2]  # Same for every landmark, so read it once
             for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                h, w, c = img.shape
                 cx, cy = int(lm.x * w), int(lm.y * h)
                 lmList.append([id, cx, cy])
                 if draw:
@@ -6,6 +6,7 @@ This script helps organize the project according to the new structure.
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 def create_directory_if_not_exists(directory):
     """Create a directory if it doesn't exist."""
@@ -13,6 +14,28 @@ def create_directory_if_not_exists(directory):
         os.makedirs(directory)
         print(f"Created directory: {directory}")
 
+def collect_files(source, destination, pairs):
+    """Recursively collect (source, destination) pairs for every file under source."""
+    create_directory_if_not_exists(destination)
+    # scandir entries carry their file type, so no extra stat call is needed per item
+    with os.scandir(source) as entries:
+        for entry in entries:
+            dest_item = os.path.join(destination, entry.name)
+            if entry.is_file(follow_symlinks=False):
+                pairs.append((entry.path, dest_item))
+            elif entry.is_dir(follow_symlinks=False):
+                collect_files(entry.path, dest_item, pairs)
+
+def copy_if_newer(source_item, dest_item):
+    """Copy a file unless the destination is already at least as new."""
+    try:
+        if os.stat(dest_item).st_mtime >= os.stat(source_item).st_mtime:
+            return False
+    except FileNotFoundError:
+        pass
+    shutil.copy2(source_item, dest_item)
+    return True
+
 def migrate_files():
     """Migrate files from the old structure to the new one."""
     # Get the base directory
@@ -39,23 +62,21 @@ def migrate_files():
     for dest in destinations.values():
         create_directory_if_not_exists(dest)
     
-    # Copy files
+    # Flatten every source tree into a list of file copies
+    pairs = []
     for key, source in sources.items():
         if os.path.exists(source):
-            destination = destinations[key]
-            
-            # Copy all files from source to destination
-            for item in os.listdir(source):
-                source_item = os.path.join(source, item)
-                dest_item = os.path.join(destination, item)
-                
-                if os.path.isfile(source_item):
-                    shutil.copy2(source_item, dest_item)
-                    print(f"Copied file: {source_item} -> {dest_item}")
-                elif os.path.isdir(source_item):
-                    if not os.path.exists(dest_item):
-                        shutil.copytree(source_item, dest_item)
-                        print(f"Copied directory: {source_item} -> {dest_item}")
+            collect_files(source, destinations[key], pairs)
+    
+    # Copying is I/O bound (the GIL is released during reads and writes), so a
+    # thread pool overlaps the copies; up-to-date files are skipped on re-runs
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        copied = list(executor.map(lambda pair: copy_if_newer(*pair), pairs))
+    
+    for (source_item, dest_item), was_copied in zip(pairs, copied):
+        if was_copied:
+            print(f"Copied file: {source_item} -> {dest_item}")
+    print(f"{sum(copied)} copied, {len(copied) - sum(copied)} already up to date")
     
     print("\nMigration completed successfully!")
     print("Please review the files in the new structure to ensure everything was copied correctly.")
@@ -4,8 +4,11 @@ Smart AI Gym Trainer - Main Entry Point
 This script serves as the main entry point for running the Smart AI Gym Trainer application.
 """
 
+import os
 from app.app import create_app
 
 if __name__ == "__main__":
+    # Development server only; use wsgi.py with gunicorn/waitress in production
     app = create_app()
-    app.run(debug=True, threaded=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    debug = os.environ.get('FLASK_ENV') == 'development'
+    app.run(debug=debug, threaded=True, host='127.0.0.1', port=5000)
\ No newline at end of file
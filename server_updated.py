@@ -1,12 +1,52 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
+import multiprocessing
+import threading
+import json
 import subprocess
+import runpy
+import atexit
+import stat
+import sys
 import os
 
 app = Flask(__name__)
 base_path = os.path.dirname(os.path.abspath(__file__))
 
-# Initial detected object
+# On Linux, exercise scripts run in forked children that inherit OpenCV and
+# MediaPipe already imported here, instead of paying a fresh interpreter start
+# and the MediaPipe import on every launch. Elsewhere (notably macOS, where
+# forking after importing cv2 crashes once a window opens) they use Popen
+_fork_context = None
+if sys.platform.startswith("linux"):
+    import cv2  # noqa: F401 - preloaded for the forked exercise processes
+    import mediapipe  # noqa: F401
+    _fork_context = multiprocessing.get_context("fork")
+
+# Script that tracks each exercise type, resolved once at import
+EXERCISE_SCRIPTS = {
+    name: os.path.join(base_path, "exercise", filename)
+    for name, filename in {
+        "push-up": "Pushup.py",
+        "squats": "squat.py",
+        "lateral-rise": "lateral2.py",
+        "alt-dumbbell-curls": "alternative2.py",
+        "barbell-row": "barbell2.py",
+        "shoulder-press": "Shoulder_press.py",
+        "tricep-dips": "Tricep_Dips.py",
+    }.items()
+}
+
+# Initial detected object, plus its serialized /get_object response body which
+# is rebuilt once per /update instead of on every poll
 detected_object = "None"
+_object_json = json.dumps({"object_name": detected_object}).encode()
+# Notified whenever detected_object changes, so /object-stream clients wake up
+# immediately instead of polling
+object_changed = threading.Condition()
+
+# Handles of the launched exercise processes, so they can be reaped and stopped
+_exercise_processes = []
+_processes_lock = threading.Lock()
 
 @app.route('/')
 def index():
@@ -22,41 +62,98 @@ def guide():
 
 @app.route('/update', methods=['POST'])
 def update():
-    global detected_object
-    detected_object = request.json.get('object_name', 'None')
+    global detected_object, _object_json
+    with object_changed:
+        detected_object = request.json.get('object_name', 'None')
+        _object_json = json.dumps({"object_name": detected_object}).encode()
+        object_changed.notify_all()
     return jsonify(success=True)
 
 @app.route('/get_object')
 def get_object():
-    return jsonify(object_name=detected_object)
+    return Response(_object_json, mimetype='application/json')
+
+@app.route('/object-stream')
+def object_stream():
+    """Stream detected object changes as Server-Sent Events"""
+    def stream():
+        last = None
+        while True:
+            with object_changed:
+                if detected_object == last:
+                    # Sleep until /update changes the object (no CPU while idle)
+                    object_changed.wait(timeout=15)
+                current, body = detected_object, _object_json
+            if current != last:
+                last = current
+                yield b"data: " + body + b"\n\n"
+            else:
+                yield b": keep-alive\n\n"  # Lets the server notice closed connections
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+def _close_inherited_sockets():
+    """Close the sockets a forked child inherits from the server (e.g. Flask's listener)"""
+    # Only called in forked children, which are only used on Linux
+    for name in os.listdir("/proc/self/fd"):
+        fd = int(name)
+        if fd <= 2:
+            continue
+        try:
+            if stat.S_ISSOCK(os.fstat(fd).st_mode):
+                os.close(fd)
+        except OSError:
+            pass  # Already closed (e.g. the descriptor listdir used)
+
+def _run_script(script_path):
+    """Run an exercise script as __main__ inside a forked child process"""
+    # Don't keep the server's port open for as long as the script runs
+    _close_inherited_sockets()
+    # Match the Popen path: relative asset and model paths in the scripts are
+    # resolved from their own folder, which is also where their helpers
+    # (e.g. pose_detector) are imported from
+    script_dir = os.path.dirname(script_path)
+    os.chdir(script_dir)
+    sys.path.insert(0, script_dir)
+    runpy.run_path(script_path, run_name="__main__")
+
+def _is_running(proc):
+    """Whether a launched exercise process is still alive (reaping it if it exited)"""
+    if isinstance(proc, subprocess.Popen):
+        return proc.poll() is None
+    return proc.is_alive()
+
+def _launch_script(script_path):
+    """Start an exercise script in its own process without going through a shell"""
+    if _fork_context is not None:
+        proc = _fork_context.Process(target=_run_script, args=(script_path,))
+        proc.start()
+    else:
+        proc = subprocess.Popen([sys.executable, script_path], cwd=os.path.dirname(script_path))
+    with _processes_lock:
+        # Drop (and reap) the scripts that have already exited
+        _exercise_processes[:] = [p for p in _exercise_processes if _is_running(p)]
+        _exercise_processes.append(proc)
+
+@atexit.register
+def _stop_scripts():
+    """Terminate the exercise scripts still running when the server exits"""
+    with _processes_lock:
+        for proc in _exercise_processes:
+            if _is_running(proc):
+                proc.terminate()
+        _exercise_processes.clear()
 
 @app.route('/run-exercise/<exercise_type>')
 def run_exercise(exercise_type):
+    script_path = EXERCISE_SCRIPTS.get(exercise_type)
+    if script_path is None:
+        return jsonify(error=f"Unknown exercise type: {exercise_type}"), 400
+    
     try:
-        script_path = None
-        if exercise_type == "push-up":
-            script_path = os.path.join(base_path, "exercise", "Pushup.py")
-        elif exercise_type == "squats":
-            script_path = os.path.join(base_path, "exercise", "squat.py")
-        elif exercise_type == "lateral-rise":
-            script_path = os.path.join(base_path, "exercise", "lateral2.py")
-        elif exercise_type == "alt-dumbbell-curls":
-            script_path = os.path.join(base_path, "exercise", "alternative2.py")
-        elif exercise_type == "barbell-row":
-            script_path = os.path.join(base_path, "exercise", "barbell2.py")
-        elif exercise_type == "shoulder-press":
-            script_path = os.path.join(base_path, "exercise", "Shoulder_press.py")
-        elif exercise_type == "tricep-dips":
-            script_path = os.path.join(base_path, "exercise", "Tricep_Dips.py")
-        else:
-            return jsonify(error=f"Unknown exercise type: {exercise_type}")
-        
-        if script_path:
-            # Start the Python script as a separate process
-            subprocess.Popen(["python", script_path], shell=True)
-            return jsonify(output=f"Started {exercise_type} tracking")
-        else:
-            return jsonify(error="Script path not found")
+        # Start the Python script as a separate process
+        _launch_script(script_path)
+        return jsonify(output=f"Started {exercise_type} tracking")
     except Exception as e:
         return jsonify(error=str(e))
 
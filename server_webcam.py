@@ -12,16 +12,111 @@ base_path = os.path.dirname(os.path.abspath(__file__))
 
 # Global variables
 camera = None
-detector = None
 exercise_type = None
 rep_count = 0
 is_running = False
+_needs_resize = True  # False once the camera is known to deliver 640x480 natively
+# Guards the published results below; held only for the brief publish / read,
+# never while a frame is being analysed
 lock = threading.Lock()
+_latest_suggestion = ""
+_latest_form = "Neutral"
+# Serializes pose detection and process_frame when several /video_feed clients
+# share the detector and tracker; the detector reuses one RGB conversion buffer
+# and keeps the last results on itself, so two clients must not interleave
+_process_lock = threading.Lock()
 
-# Initial detected object for food recognition
+# Initial detected object for food recognition, guarded by its own lock so
+# /update and /get_object polling never contend with the exercise state lock
 detected_object = "None"
+_object_lock = threading.Lock()
+
+# Loading the MediaPipe graph takes hundreds of milliseconds, so build the
+# detector once at startup and run one dummy frame through it to finish its
+# lazy initialisation; every exercise session reuses it
+detector = PoseDetector()
+detector.findPose(np.zeros((480, 640, 3), dtype=np.uint8), draw=False)
+
+# Per-exercise form feedback: each takes the joint angle and returns
+# (suggestion, form_quality)
+def _eval_pushup(angle):
+    if angle < 80:
+        return "Bend your arms more to go lower!", "Bad Form"
+    elif angle > 150:
+        return "Straighten your elbows at the top!", "Good Form"
+    elif angle > 90 and angle < 120:
+        return "Keep your back straight, not too high or low", "Good Form"
+    return "Maintain controlled movement", "Neutral"
+
+def _eval_squats(angle):
+    if angle < 80:
+        return "Go deeper, bend your knees more", "Good Form"
+    elif angle > 150:
+        return "Stand tall, keep core engaged", "Good Form"
+    return "Keep knees aligned with toes", "Neutral"
+
+def _eval_shoulder_press(angle):
+    if angle < 70:
+        return "Lower the weights more, full range of motion", "Good Form"
+    elif angle > 160:
+        return "Extend arms fully overhead", "Good Form"
+    return "Press weights directly overhead", "Neutral"
+
+def _eval_lateral_rise(angle):
+    if angle < 90:
+        return "Raise arms to shoulder height", "Bad Form"
+    elif angle > 110:
+        return "Don't raise arms too high", "Bad Form"
+    return "Perfect height, maintain control", "Good Form"
+
+def _eval_barbell_row(angle):
+    if angle < 80:
+        return "Pull barbell closer to your body", "Good Form"
+    elif angle > 130:
+        return "Lower the weight with control", "Neutral"
+    return "Keep your back straight", "Good Form"
+
+def _eval_tricep_dips(angle):
+    if angle < 70:
+        return "Go deeper for full tricep engagement", "Good Form"
+    elif angle > 150:
+        return "Straighten arms completely at top", "Good Form"
+    return "Keep elbows close to body", "Neutral"
+
+def _eval_curls(angle):
+    if angle < 60:
+        return "Curl the weight fully to shoulder", "Good Form"
+    elif angle > 160:
+        return "Extend arm fully between reps", "Good Form"
+    return "Keep elbow fixed by your side", "Neutral"
+
+def _eval_default(angle):
+    # Generic fallback for any other exercise
+    return "Maintain proper form throughout", "Neutral"
+
+_EXERCISE_EVALS = {
+    "push-up": _eval_pushup,
+    "squats": _eval_squats,
+    "shoulder-press": _eval_shoulder_press,
+    "lateral-rise": _eval_lateral_rise,
+    "barbell-row": _eval_barbell_row,
+    "tricep-dips": _eval_tricep_dips,
+    "alt-dumbbell-curls": _eval_curls,
+}
+
+# Text and background colors (BGR) of the form quality label
+_FORM_COLORS = {
+    "Good Form": (0, 255, 0),
+    "Bad Form": (0, 0, 255),
+    "Wrong Exercise": (0, 0, 255),
+    "Neutral": (255, 255, 255),
+}
+_BG_COLORS = {"Wrong Exercise": (0, 0, 128)}
 
 class ExerciseTracker:
+    # Form-quality label -> (rect x0, rect x1, text x); the labels are a small fixed set
+    _TEXT_METRICS = {}
+    
     def __init__(self, exercise_type):
         self.exercise_type = exercise_type
         self.count = 0
@@ -36,10 +131,33 @@ class ExerciseTracker:
         self.last_angle = 0
         self.confidence_threshold = 0.0  # For motion validation
         self.motion_history = []  # To track the pattern of movement
+        # Ring buffers of the last 10 positions used by movement validation;
+        # *_head is the next slot to write, *_filled how many slots hold data
+        self.wrist_y_history = np.empty(10, dtype=np.float32)
+        self._wy_head = 0
+        self._wy_filled = 0
+        self.elbow_position_history = np.empty((10, 2), dtype=np.float32)
+        self._ep_head = 0
+        self._ep_filled = 0
         
         # Set exercise-specific parameters
         self._configure_exercise_params()
         
+        # The wrong-exercise warning only depends on the exercise type
+        self.warning_text = f"Detected: Not {self.exercise_type.replace('-', ' ')}"
+        warning_width = cv2.getTextSize(self.warning_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0][0]
+        self._warning_coords = (320 - warning_width//2 - 10, 320 + warning_width//2 + 10, 320 - warning_width//2)
+        
+    def _text_metrics(self, text):
+        """Return cached (x0, x1, text_x) for a centered form-quality label"""
+        metrics = self._TEXT_METRICS.get(text)
+        if metrics is None:
+            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+            text_width = text_size[0] + 20  # Add padding
+            metrics = (320 - text_width//2, 320 + text_width//2, 320 - text_size[0]//2)
+            self._TEXT_METRICS[text] = metrics
+        return metrics
+        
     def _configure_exercise_params(self):
         """Set exercise-specific parameters like angles and thresholds"""
         if self.exercise_type == "push-up":
@@ -97,27 +215,32 @@ class ExerciseTracker:
         else:
             # Default
             self.points = [11, 13, 15]
+        
+        # Used to map the angle onto the rep percentage without np.interp per frame
+        self._inv_range = 1.0 / (self.high - self.low)
+        # Resolve the feedback handler once instead of comparing the type every frame
+        self._eval_fn = _EXERCISE_EVALS.get(self.exercise_type, _eval_default)
     
-    def _validate_movement(self, lmList):
-        """Validate that the movement matches the expected pattern for the exercise"""
+    def _validate_movement(self, lm):
+        """Validate that the movement matches the expected pattern for the exercise
+        
+        Args:
+            lm: Landmarks as a (33, 3) float32 array of [id, x, y] rows
+        """
         is_valid = True
         
         if self.exercise_type == "shoulder-press":
             # For shoulder press, check that wrists move significantly upward
             # Check if wrist is moving vertically above elbow
-            if len(lmList) > 15:  # Ensure we have wrist and shoulder points
-                wrist = lmList[15][1:3]  # Wrist position
-                elbow = lmList[13][1:3]  # Elbow position
-                shoulder = lmList[11][1:3]  # Shoulder position
-                
-                # Store motion history for shoulder press validation
-                if not hasattr(self, 'wrist_y_history'):
-                    self.wrist_y_history = []
+            if len(lm) > 15:  # Ensure we have wrist and shoulder points
+                wrist = lm[15, 1:]  # Wrist position
+                elbow = lm[13, 1:]  # Elbow position
+                shoulder = lm[11, 1:]  # Shoulder position
                 
-                # Add current wrist Y position to history
-                self.wrist_y_history.append(wrist[1])
-                if len(self.wrist_y_history) > 10:
-                    self.wrist_y_history.pop(0)
+                # Add current wrist Y position to history, overwriting the oldest
+                self.wrist_y_history[self._wy_head] = wrist[1]
+                self._wy_head = (self._wy_head + 1) % 10
+                self._wy_filled = min(self._wy_filled + 1, 10)
                 
                 # For shoulder press:
                 # 1. Wrists must go above shoulders at the top
@@ -126,9 +249,9 @@ class ExerciseTracker:
                 
                 # Detect if movement pattern matches bicep curl
                 # In bicep curls, wrist stays below shoulder height and moves toward shoulder
-                if len(self.wrist_y_history) > 5:
+                if self._wy_filled > 5:
                     # Check if wrist stays below shoulder level (typical for bicep curl)
-                    if all(y > shoulder[1] for y in self.wrist_y_history):
+                    if np.all(self.wrist_y_history[:self._wy_filled] > shoulder[1]):
                         is_valid = False
                         self.suggestion = "This looks like a bicep curl, not a shoulder press"
                 
@@ -140,19 +263,15 @@ class ExerciseTracker:
                 
         elif self.exercise_type == "alt-dumbbell-curls":
             # For bicep curls, elbow should remain relatively fixed
-            if len(lmList) > 15:
-                shoulder = lmList[11][1:3]  # Shoulder position
-                elbow = lmList[13][1:3]  # Elbow position
-                wrist = lmList[15][1:3]  # Wrist position
+            if len(lm) > 15:
+                shoulder = lm[11, 1:]  # Shoulder position
+                elbow = lm[13, 1:]  # Elbow position
+                wrist = lm[15, 1:]  # Wrist position
                 
-                # Store elbow position history if not already done
-                if not hasattr(self, 'elbow_position_history'):
-                    self.elbow_position_history = []
-                    
-                # Add current elbow position to history
-                self.elbow_position_history.append(elbow)
-                if len(self.elbow_position_history) > 10:
-                    self.elbow_position_history.pop(0)
+                # Add current elbow position to history, overwriting the oldest
+                self.elbow_position_history[self._ep_head] = elbow
+                self._ep_head = (self._ep_head + 1) % 10
+                self._ep_filled = min(self._ep_filled + 1, 10)
                     
                 # Calculate change in elbow position
                 elbow_x_change = abs(elbow[0] - self.last_elbow_x) if hasattr(self, 'last_elbow_x') else 0
@@ -185,100 +304,20 @@ class ExerciseTracker:
             self.angle = detector.findAngle(img, self.points[0], self.points[1], self.points[2])
         
         # Validate the movement pattern is correct for this exercise
-        is_valid_movement = self._validate_movement(lmList)
+        # One contiguous array instead of list-of-lists slicing for every point lookup
+        is_valid_movement = self._validate_movement(np.asarray(lmList, dtype=np.float32))
         if not is_valid_movement:
             self.form_quality = "Wrong Exercise"
             if not self.suggestion:
                 self.suggestion = f"This doesn't look like a {self.exercise_type.replace('-', ' ')}"
             return img  # Skip rep counting if wrong movement
 
-        # Process specific exercise feedback
-        if self.exercise_type == "push-up":
-            if self.angle < 80:
-                self.suggestion = "Bend your arms more to go lower!"
-                self.form_quality = "Bad Form"
-            elif self.angle > 150:
-                self.suggestion = "Straighten your elbows at the top!"
-                self.form_quality = "Good Form"
-            elif self.angle > 90 and self.angle < 120:
-                self.suggestion = "Keep your back straight, not too high or low"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Maintain controlled movement"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "squats":
-            if self.angle < 80:
-                self.suggestion = "Go deeper, bend your knees more"
-                self.form_quality = "Good Form" 
-            elif self.angle > 150:
-                self.suggestion = "Stand tall, keep core engaged"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Keep knees aligned with toes"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "shoulder-press":
-            if self.angle < 70:
-                self.suggestion = "Lower the weights more, full range of motion"
-                self.form_quality = "Good Form"
-            elif self.angle > 160:
-                self.suggestion = "Extend arms fully overhead"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Press weights directly overhead"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "lateral-rise":
-            if self.angle < 90:
-                self.suggestion = "Raise arms to shoulder height"
-                self.form_quality = "Bad Form"
-            elif self.angle > 110:
-                self.suggestion = "Don't raise arms too high"
-                self.form_quality = "Bad Form"
-            else:
-                self.suggestion = "Perfect height, maintain control"
-                self.form_quality = "Good Form"
-                
-        elif self.exercise_type == "barbell-row":
-            if self.angle < 80:
-                self.suggestion = "Pull barbell closer to your body"
-                self.form_quality = "Good Form"
-            elif self.angle > 130:
-                self.suggestion = "Lower the weight with control"
-                self.form_quality = "Neutral"
-            else:
-                self.suggestion = "Keep your back straight"
-                self.form_quality = "Good Form"
-                
-        elif self.exercise_type == "tricep-dips":
-            if self.angle < 70:
-                self.suggestion = "Go deeper for full tricep engagement"
-                self.form_quality = "Good Form"
-            elif self.angle > 150:
-                self.suggestion = "Straighten arms completely at top"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Keep elbows close to body"
-                self.form_quality = "Neutral"
-                
-        elif self.exercise_type == "alt-dumbbell-curls":
-            if self.angle < 60:
-                self.suggestion = "Curl the weight fully to shoulder"
-                self.form_quality = "Good Form"
-            elif self.angle > 160:
-                self.suggestion = "Extend arm fully between reps"
-                self.form_quality = "Good Form"
-            else:
-                self.suggestion = "Keep elbow fixed by your side"
-                self.form_quality = "Neutral"
-        else:
-            # Generic fallback for any other exercise
-            self.suggestion = "Maintain proper form throughout"
-            self.form_quality = "Neutral"
+        # Process specific exercise feedback (handler picked once per exercise type)
+        self.suggestion, self.form_quality = self._eval_fn(self.angle)
 
-        per = np.interp(self.angle, (self.low, self.high), (0, 100))
-        bar = np.interp(self.angle, (self.low, self.high), (650, 100))
+        # Position within the low-high range, clamped to [0, 1] like np.interp
+        t = max(0.0, min(1.0, (self.angle - self.low) * self._inv_range))
+        per = t * 100.0
 
         # Only count reps if we've verified this is the correct exercise movement
         if self.form_quality != "Wrong Exercise":
@@ -293,7 +332,7 @@ class ExerciseTracker:
         # Adjust UI for smaller 640x480 resolution
         
         # Draw simpler progress bar on the right side
-        bar_height = np.interp(self.angle, (self.low, self.high), (350, 100))
+        bar_height = 350.0 - t * 250.0
         cv2.rectangle(img, (580, 100), (620, 350), (0, 255, 0), 2)
         cv2.rectangle(img, (580, int(bar_height)), (620, 350), (0, 255, 0), cv2.FILLED)
         cv2.putText(img, f'{int(per)}%', (560, 80), cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 255), 2)
@@ -302,36 +341,27 @@ class ExerciseTracker:
         cv2.putText(img, f'Reps: {int(self.count)}', (20, 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
         
         # Display form quality with color coding
-        form_color = (255, 255, 255)  # Default white for neutral
-        if self.form_quality == "Good Form":
-            form_color = (0, 255, 0)  # Green for good form
-        elif self.form_quality == "Bad Form":
-            form_color = (0, 0, 255)  # Red for bad form
-        elif self.form_quality == "Wrong Exercise":
-            form_color = (0, 0, 255)  # Red for wrong exercise
+        form_color = _FORM_COLORS.get(self.form_quality, (255, 255, 255))
             
         # Display text based on form quality
         display_text = self.form_quality
         
         # Simplified form quality display - just text with colored background
-        text_size = cv2.getTextSize(display_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
-        text_width = text_size[0] + 20  # Add padding
+        x0, x1, text_x = self._text_metrics(display_text)
         
         # Draw background rectangle for text
-        bg_color = (0, 0, 0)  # Default black background
-        if self.form_quality == "Wrong Exercise":
-            bg_color = (0, 0, 128)  # Darker red background for wrong exercise
+        bg_color = _BG_COLORS.get(self.form_quality, (0, 0, 0))
         
         cv2.rectangle(img, 
-                     (320 - text_width//2, 30), 
-                     (320 + text_width//2, 70), 
+                     (x0, 30), 
+                     (x1, 70), 
                      bg_color, 
                      -1)  # Filled rectangle
                      
         # Draw the form quality text
         cv2.putText(img, 
                    display_text, 
-                   (320 - text_size[0]//2, 58),  # Center text
+                   (text_x, 58),  # Center text
                    cv2.FONT_HERSHEY_SIMPLEX, 
                    0.8, 
                    form_color, 
@@ -340,19 +370,18 @@ class ExerciseTracker:
         # If wrong exercise is detected, also show a more prominent warning
         if self.form_quality == "Wrong Exercise":
             # Add a warning message at the bottom
-            warning_text = f"Detected: Not {self.exercise_type.replace('-', ' ')}"
-            warning_size = cv2.getTextSize(warning_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+            wx0, wx1, wtext_x = self._warning_coords
             
             # Warning at the bottom with transparent background
             cv2.rectangle(img, 
-                         (320 - warning_size[0]//2 - 10, 420), 
-                         (320 + warning_size[0]//2 + 10, 460), 
+                         (wx0, 420), 
+                         (wx1, 460), 
                          (0, 0, 80), 
                          -1)  # Filled rectangle
                          
             cv2.putText(img, 
-                       warning_text, 
-                       (320 - warning_size[0]//2, 450),  # Center text
+                       self.warning_text, 
+                       (wtext_x, 450),  # Center text
                        cv2.FONT_HERSHEY_SIMPLEX, 
                        0.9, 
                        (255, 255, 255), 
@@ -363,30 +392,45 @@ class ExerciseTracker:
     def get_suggestion(self):
         return self.suggestion
 
+def _build_inactive_jpeg():
+    """Encode the frame shown while exercise tracking is not active"""
+    blank_frame = np.zeros((480, 640, 3), dtype=np.uint8)  # Smaller blank frame
+    cv2.putText(blank_frame, "Exercise tracking not active", (150, 240), 
+               cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    _, buffer = cv2.imencode('.jpg', blank_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return buffer.tobytes()
+
+# Multipart framing for the MJPEG stream; the JPEG is yielded as its own chunk
+# between these instead of being concatenated into a new bytes object per frame
+_MJPEG_PREFIX = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+_MJPEG_SUFFIX = b'\r\n'
+
+# The inactive frame never changes, so encode it once instead of on every tick
+_INACTIVE_JPEG = _build_inactive_jpeg()
+
 def generate_frames():
-    global camera, detector, exercise_type, rep_count, is_running
-    last_processing_time = time.time()
+    global camera, detector, exercise_type, rep_count, is_running, _latest_suggestion, _latest_form
     frame_interval = 1/30  # Target 30 FPS
+    # Destination for cv2.resize, reused so frames don't allocate
+    resize_buf = np.empty((480, 640, 3), dtype=np.uint8)
+    next_deadline = time.monotonic() + frame_interval
     
     while True:
-        current_time = time.time()
-        
-        # Skip processing if it's been less than the frame interval (prevents overloading CPU)
-        if current_time - last_processing_time < frame_interval:
-            time.sleep(0.001)  # Small sleep to prevent CPU hogging
-            continue
-            
-        last_processing_time = current_time
+        # Sleep once until the next frame is due instead of polling the clock
+        # (prevents overloading CPU)
+        delay = next_deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            next_deadline += frame_interval
+        else:
+            # Fell behind (slow frame); restart the schedule rather than bursting to catch up
+            next_deadline = time.monotonic() + frame_interval
         
         if not is_running:
-            # If we're not tracking, just yield a blank frame
-            blank_frame = np.zeros((480, 640, 3), dtype=np.uint8)  # Smaller blank frame
-            cv2.putText(blank_frame, "Exercise tracking not active", (150, 240), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            _, buffer = cv2.imencode('.jpg', blank_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            frame = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            # If we're not tracking, just yield the pre-encoded blank frame
+            yield _MJPEG_PREFIX
+            yield _INACTIVE_JPEG
+            yield _MJPEG_SUFFIX
             time.sleep(0.03)  # Slower refresh when inactive
             continue
         
@@ -397,24 +441,35 @@ def generate_frames():
                 time.sleep(0.01)
                 continue  # Skip this iteration and try again
             
-            # Lower resolution for better performance (640x480 instead of 1280x720)
-            img = cv2.resize(img, (640, 480))
+            # Lower resolution for better performance (640x480 instead of 1280x720),
+            # unless the camera already delivers 640x480
+            if _needs_resize:
+                img = cv2.resize(img, (640, 480), dst=resize_buf)
             
-            # Detect pose
-            img = detector.findPose(img, draw=True)
-            lmList = detector.findPosition(img, draw=False)
-            
-            with lock:
-                if exercise_tracker:
-                    img = exercise_tracker.process_frame(img, lmList, detector)
-                    rep_count = exercise_tracker.count
+            # Detect pose and analyse the frame without holding the status lock,
+            # so /get-reps never waits on pose processing, then publish the results
+            tracker = exercise_tracker
+            with _process_lock:
+                img = detector.findPose(img, draw=True)
+                lmList = detector.findPosition(img, draw=False)
+                if tracker:
+                    img = tracker.process_frame(img, lmList, detector)
+                    count = tracker.count
+                    suggestion = tracker.get_suggestion()
+                    form_quality = tracker.form_quality
+            if tracker:
+                with lock:
+                    rep_count = count
+                    _latest_suggestion = suggestion
+                    _latest_form = form_quality
             
             # Encode with lower quality for faster streaming
             _, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 80])
             frame = buffer.tobytes()
             
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            yield _MJPEG_PREFIX
+            yield frame
+            yield _MJPEG_SUFFIX
                    
         except Exception as e:
             print(f"Frame generation error: {e}")
@@ -510,11 +565,12 @@ def logout():
 @app.route('/video_feed')
 def video_feed():
     return Response(generate_frames(),
-                    mimetype='multipart/x-mixed-replace; boundary=frame')
+                    mimetype='multipart/x-mixed-replace; boundary=frame',
+                    direct_passthrough=True)
 
 @app.route('/start-exercise/<exercise>')
 def start_exercise(exercise):
-    global camera, detector, exercise_type, is_running, exercise_tracker
+    global camera, exercise_type, is_running, exercise_tracker, _latest_suggestion, _latest_form, _needs_resize
     
     # Check if exercise type is valid
     valid_exercises = ["lateral-rise", "alt-dumbbell-curls", "barbell-row", 
@@ -537,15 +593,19 @@ def start_exercise(exercise):
     camera.set(cv2.CAP_PROP_FPS, 30)  # Target 30 FPS
     
     # Verify camera is working
-    success, _ = camera.read()
+    success, frame = camera.read()
     if not success:
         return jsonify(success=False, error="Could not access webcam. Please check your camera connection.")
     
-    detector = PoseDetector()
+    # Only resize frames later if the camera ignored the requested resolution
+    _needs_resize = frame.shape[:2] != (480, 640)
+    
     exercise_type = exercise
     
     with lock:
         exercise_tracker = ExerciseTracker(exercise)
+        _latest_suggestion = ""
+        _latest_form = "Neutral"
         is_running = True
     
     return jsonify(success=True, message=f"Started {exercise} tracking")
@@ -571,21 +631,25 @@ def stop_exercise():
 def get_reps():
     with lock:
         count = rep_count
-        suggestion = exercise_tracker.get_suggestion() if exercise_tracker else ""
+        suggestion = _latest_suggestion
         # Add form quality information
-        form_quality = exercise_tracker.form_quality if exercise_tracker else "Neutral"
-        is_wrong_exercise = form_quality == "Wrong Exercise"
+        form_quality = _latest_form
+    is_wrong_exercise = form_quality == "Wrong Exercise"
     return jsonify(count=count, suggestion=suggestion, form_quality=form_quality, wrong_exercise=is_wrong_exercise)
 
 @app.route('/update', methods=['POST'])
 def update():
     global detected_object
-    detected_object = request.json.get('object_name', 'None')
+    object_name = request.json.get('object_name', 'None')
+    with _object_lock:
+        detected_object = object_name
     return jsonify(success=True)
 
 @app.route('/get_object')
 def get_object():
-    return jsonify(object_name=detected_object)
+    with _object_lock:
+        object_name = detected_object
+    return jsonify(object_name=object_name)
 
 # Initialize variables
 exercise_tracker = None
@@ -595,6 +659,10 @@ from werkzeug.serving import WSGIRequestHandler
 WSGIRequestHandler.protocol_version = "HTTP/1.1"
 
 if __name__ == '__main__':
-    # Turn on debugging to see any errors
+    # Development server only. In production serve the module with a threaded
+    # WSGI server (one process, since the camera and tracker are module globals):
+    #   gunicorn --worker-class gthread -w 1 --threads 8 -b 127.0.0.1:5000 server_webcam:app
+    # Debug mode (reloader + debugger) only with FLASK_ENV=development
+    debug = os.environ.get('FLASK_ENV') == 'development'
     # Increase the number of threads to handle multiple clients
-    app.run(debug=True, threaded=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    app.run(debug=debug, threaded=True, host='127.0.0.1', port=5000)
\ No newline at end of file
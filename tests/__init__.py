@@ -0,0 +1,3 @@
+"""
+Empty __init__.py file to make the directory a proper Python package.
+"""
\ No newline at end of file
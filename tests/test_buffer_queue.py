@@ -0,0 +1,70 @@
+"""
+Tests for app.backend.utils.buffer_queue.BufferQueue.
+"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from app.backend.utils.buffer_queue import BufferQueue
+
+
+def test_put_on_full_queue_drops_oldest_item():
+    q = BufferQueue(maxsize=2)
+    for item in (1, 2, 3, 4):
+        q.put(item)
+    assert q.qsize() == 2
+    assert [q.get_nowait(), q.get_nowait()] == [3, 4]
+
+
+def test_put_nowait_never_raises_full():
+    q = BufferQueue(maxsize=1)
+    q.put_nowait("old")
+    q.put_nowait("new")
+    assert q.get_nowait() == "new"
+    assert q.empty()
+
+
+def test_dropped_items_do_not_leave_unfinished_tasks():
+    q = BufferQueue(maxsize=1)
+    for item in range(5):
+        q.put(item)
+    q.get()
+    q.task_done()
+    q.join()  # Would block forever if the dropped puts were still counted
+
+
+def test_get_with_timeout_receives_item_from_other_thread():
+    q = BufferQueue(maxsize=1)
+    producer = threading.Timer(0.05, q.put, args=("frame",))
+    producer.start()
+    try:
+        assert q.get(timeout=2.0) == "frame"
+    finally:
+        producer.join()
+
+
+def test_get_with_timeout_raises_empty_when_nothing_arrives():
+    q = BufferQueue(maxsize=1)
+    start = time.monotonic()
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.05)
+    assert time.monotonic() - start >= 0.05
+
+
+def test_put_with_timeout_on_full_queue_does_not_block():
+    q = BufferQueue(maxsize=1)
+    q.put("old")
+    done = threading.Event()
+
+    def producer():
+        q.put("new", timeout=5.0)
+        done.set()
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    thread.join(timeout=1.0)
+    assert done.is_set()
+    assert q.get(timeout=1.0) == "new"
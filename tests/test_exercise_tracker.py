@@ -0,0 +1,184 @@
+"""
+Tests for the exercise trackers in app.backend.exercise_modules.exercise_tracker.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.backend.exercise_modules.exercise_tracker import (
+    BarbellRowTracker,
+    DumbbellCurlTracker,
+    ExerciseTracker,
+    LateralRiseTracker,
+    PushUpTracker,
+    ShoulderPressTracker,
+    SquatTracker,
+    TricepDipsTracker,
+    create_tracker,
+)
+
+
+def _landmarks(angle, points=(11, 13, 15), below=False):
+    """
+    Build a (33, 3) landmark array whose joint triple forms the given angle.
+
+    The vertex sits at (1000, 1000) and both limbs are 800 px long, so integer
+    rounding moves the angle by well under 0.1 degrees.
+
+    Args:
+        angle: Angle in degrees at the middle point of the triple
+        points: Landmark ids (p1, p2, p3) of the tracked joint triple
+        below: Put the third point below the vertex instead of above it
+    """
+    lm = np.zeros((33, 3), dtype=np.int32)
+    lm[:, 0] = np.arange(33)
+    lm[:, 1:] = 1000
+    p1, _, p3 = points
+    lm[p1, 1:] = (1800, 1000)
+    rad = math.radians(angle)
+    sign = 1 if below else -1
+    lm[p3, 1:] = (round(1000 + 800 * math.cos(rad)), round(1000 + sign * 800 * math.sin(rad)))
+    return lm
+
+
+def _feed(tracker, angles):
+    """Run one frame per angle through the tracker and return the count after each"""
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    counts = []
+    for angle in angles:
+        tracker.process_frame(img, _landmarks(angle, tracker.points).tolist(), None)
+        counts.append(tracker.count)
+    return counts
+
+
+# Push-ups map 70-160 degrees onto 0-100%, so the 95% / 5% band edges are
+# 155.5 and 74.5 degrees
+
+def test_overshoot_and_undershoot_count_one_rep_each():
+    counts = _feed(PushUpTracker(), [165, 60, 170, 65, 175])
+    assert counts == [0, 0, 1, 1, 2]
+
+
+def test_jitter_around_top_of_band_does_not_double_count():
+    # After the rep is counted, the angle hovers across 95% without returning
+    # to the bottom, which must not add reps
+    counts = _feed(PushUpTracker(), [73, 157, 154, 158, 152, 157, 150])
+    assert counts == [0, 1, 1, 1, 1, 1, 1]
+
+
+def test_jitter_around_bottom_of_band_arms_once():
+    counts = _feed(PushUpTracker(), [73, 76, 72, 77, 73, 157])
+    assert counts == [0, 0, 0, 0, 0, 1]
+
+
+def test_reps_that_stop_short_of_the_range_ends_still_count():
+    # Reps peaking at ~97% and bottoming at ~3% never reach exactly 100% / 0%,
+    # so exact-equality counting missed every one of them
+    counts = _feed(PushUpTracker(), [157, 73, 157, 73, 157, 73, 157])
+    assert counts[-1] == 3
+
+
+def test_frames_without_a_pose_do_not_change_the_count():
+    tracker = PushUpTracker()
+    _feed(tracker, [60, 170])
+    tracker.process_frame(np.zeros((480, 640, 3), dtype=np.uint8), None, None)
+    assert tracker.count == 1
+    assert tracker.suggestion == "Make sure your body is visible to the camera."
+
+
+@pytest.mark.parametrize("exercise_type, tracker_class", [
+    ("push-up", PushUpTracker),
+    ("squats", SquatTracker),
+    ("shoulder-press", ShoulderPressTracker),
+    ("lateral-rise", LateralRiseTracker),
+    ("barbell-row", BarbellRowTracker),
+    ("tricep-dips", TricepDipsTracker),
+    ("alt-dumbbell-curls", DumbbellCurlTracker),
+])
+def test_create_tracker_returns_exercise_subclass(exercise_type, tracker_class):
+    tracker = create_tracker(exercise_type)
+    assert type(tracker) is tracker_class
+    assert tracker.exercise_type == exercise_type
+
+
+def test_unknown_exercise_falls_back_to_generic_tracker():
+    tracker = create_tracker("unknown")
+    assert type(tracker) is ExerciseTracker
+    assert tracker.exercise_type == "unknown"
+    assert (tracker.low, tracker.high, tracker.points) == (70, 160, [11, 13, 15])
+
+
+# (suggestion, form_quality) produced by the original single-class tracker for
+# one frame at each angle; "below" puts the wrist (or ankle) below the joint
+FEEDBACK_CASES = [
+    ('push-up', 45, False, 'Bend your arms more to go lower!', 'Bad Form'),
+    ('push-up', 75, False, 'Bend your arms more to go lower!', 'Bad Form'),
+    ('push-up', 100, False, 'Keep your back straight, not too high or low', 'Good Form'),
+    ('push-up', 115, False, 'Keep your back straight, not too high or low', 'Good Form'),
+    ('push-up', 140, False, 'Maintain controlled movement', 'Neutral'),
+    ('push-up', 165, False, 'Straighten your elbows at the top!', 'Good Form'),
+    ('squats', 45, False, 'Go deeper, bend your knees more', 'Good Form'),
+    ('squats', 75, False, 'Go deeper, bend your knees more', 'Good Form'),
+    ('squats', 100, False, 'Keep knees aligned with toes', 'Neutral'),
+    ('squats', 115, False, 'Keep knees aligned with toes', 'Neutral'),
+    ('squats', 140, False, 'Keep knees aligned with toes', 'Neutral'),
+    ('squats', 165, False, 'Stand tall, keep core engaged', 'Good Form'),
+    ('shoulder-press', 45, False, 'Lower the weights more, full range of motion', 'Good Form'),
+    ('shoulder-press', 75, False, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 100, False, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 115, False, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 140, False, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 165, False, 'Extend arms fully overhead', 'Good Form'),
+    ('shoulder-press', 45, True, 'Extend arms upward for shoulder press', 'Wrong Exercise'),
+    ('shoulder-press', 75, True, 'Extend arms upward for shoulder press', 'Wrong Exercise'),
+    ('shoulder-press', 100, True, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 115, True, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 140, True, 'Press weights directly overhead', 'Neutral'),
+    ('shoulder-press', 165, True, 'Extend arms fully overhead', 'Good Form'),
+    ('lateral-rise', 45, False, 'Raise arms to shoulder height', 'Bad Form'),
+    ('lateral-rise', 75, False, 'Raise arms to shoulder height', 'Bad Form'),
+    ('lateral-rise', 100, False, 'Perfect height, maintain control', 'Good Form'),
+    ('lateral-rise', 115, False, "Don't raise arms too high", 'Bad Form'),
+    ('lateral-rise', 140, False, "Don't raise arms too high", 'Bad Form'),
+    ('lateral-rise', 165, False, "Don't raise arms too high", 'Bad Form'),
+    ('barbell-row', 45, False, 'Pull barbell closer to your body', 'Good Form'),
+    ('barbell-row', 75, False, 'Pull barbell closer to your body', 'Good Form'),
+    ('barbell-row', 100, False, 'Keep your back straight', 'Good Form'),
+    ('barbell-row', 115, False, 'Keep your back straight', 'Good Form'),
+    ('barbell-row', 140, False, 'Lower the weight with control', 'Neutral'),
+    ('barbell-row', 165, False, 'Lower the weight with control', 'Neutral'),
+    ('tricep-dips', 45, False, 'Go deeper for full tricep engagement', 'Good Form'),
+    ('tricep-dips', 75, False, 'Keep elbows close to body', 'Neutral'),
+    ('tricep-dips', 100, False, 'Keep elbows close to body', 'Neutral'),
+    ('tricep-dips', 115, False, 'Keep elbows close to body', 'Neutral'),
+    ('tricep-dips', 140, False, 'Keep elbows close to body', 'Neutral'),
+    ('tricep-dips', 165, False, 'Straighten arms completely at top', 'Good Form'),
+    ('alt-dumbbell-curls', 45, False, 'Keep wrist movement in front of body for curls', 'Wrong Exercise'),
+    ('alt-dumbbell-curls', 75, False, 'Keep wrist movement in front of body for curls', 'Wrong Exercise'),
+    ('alt-dumbbell-curls', 100, False, 'Keep wrist movement in front of body for curls', 'Wrong Exercise'),
+    ('alt-dumbbell-curls', 115, False, 'Keep wrist movement in front of body for curls', 'Wrong Exercise'),
+    ('alt-dumbbell-curls', 140, False, 'Keep wrist movement in front of body for curls', 'Wrong Exercise'),
+    ('alt-dumbbell-curls', 165, False, 'Keep wrist movement in front of body for curls', 'Wrong Exercise'),
+    ('alt-dumbbell-curls', 45, True, 'Curl the weight fully to shoulder', 'Good Form'),
+    ('alt-dumbbell-curls', 75, True, 'Keep elbow fixed by your side', 'Neutral'),
+    ('alt-dumbbell-curls', 100, True, 'Keep elbow fixed by your side', 'Neutral'),
+    ('alt-dumbbell-curls', 115, True, 'Keep elbow fixed by your side', 'Neutral'),
+    ('alt-dumbbell-curls', 140, True, 'Keep elbow fixed by your side', 'Neutral'),
+    ('alt-dumbbell-curls', 165, True, 'Extend arm fully between reps', 'Good Form'),
+    ('unknown', 45, False, 'Maintain proper form throughout', 'Neutral'),
+    ('unknown', 75, False, 'Maintain proper form throughout', 'Neutral'),
+    ('unknown', 100, False, 'Maintain proper form throughout', 'Neutral'),
+    ('unknown', 115, False, 'Maintain proper form throughout', 'Neutral'),
+    ('unknown', 140, False, 'Maintain proper form throughout', 'Neutral'),
+    ('unknown', 165, False, 'Maintain proper form throughout', 'Neutral'),
+]
+
+
+@pytest.mark.parametrize("exercise_type, angle, below, suggestion, form_quality", FEEDBACK_CASES)
+def test_feedback_matches_original_tracker(exercise_type, angle, below, suggestion, form_quality):
+    tracker = create_tracker(exercise_type)
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker.process_frame(img, _landmarks(angle, tracker.points, below).tolist(), None)
+    assert (tracker.suggestion, tracker.form_quality) == (suggestion, form_quality)
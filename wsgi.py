@@ -0,0 +1,16 @@
+"""
+Smart AI Gym Trainer - WSGI Entry Point
+---------------------------------------
+Production entry point for serving the application with a WSGI server
+instead of Flask's development server, e.g.:
+
+    gunicorn --worker-class gthread -w 1 --threads 8 -b 127.0.0.1:5000 wsgi:app
+    waitress-serve --host 127.0.0.1 --port 5000 --threads 8 wsgi:app   (Windows)
+
+Use a single worker process: the camera and exercise state live in module
+globals, so every request has to reach the same process.
+"""
+
+from app.app import create_app
+
+app = create_app()